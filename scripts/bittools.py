@@ -2,15 +2,23 @@
 
 # Common functions for bittools Python scripts
 
+# 2026-10-18 Keep the module level imports light, as every script
+# pays for them at startup. jsonrpclib (which pulls in http.client,
+# email and ssl), json, urllib, random and the like are imported in
+# the functions that need them.
+
 import os.path
-from math import ceil, exp
+import re
+from struct import Struct
 from time import ctime, time
 
-# https://github.com/joshmarshall/jsonrpclib
-from jsonrpclib import Server
+from threading import Lock
 
 from sys import exit, version_info
 
+# 2026-10-18 Coin constants and reward schedules
+from coins import *
+
 def ReadLines(f):
     File = open(f, "r")
     contents = File.readlines()
@@ -32,7 +40,183 @@ def prettyprint(array, delimiter=" "):
             width.append(max(map(lambda x: printlength(x[column]), array)))
 
         for i in array:
-            print(delimiter.join(map(lambda col: i[col] + " "*(width[col] - printlength(i[col])), range(columns - 1))) + delimiter + i[columns-1])
+            printrow(i, width, delimiter)
+
+def printrow(i, width, delimiter=" "):
+    columns = len(i)
+    print(delimiter.join(map(lambda col: i[col] + " "*(width[col] - printlength(i[col])), range(columns - 1))) + delimiter + i[columns-1])
+
+def streamprint(rows, delimiter=" ", sample=100):
+    # 2026-10-18 prettyprint for an iterator of rows, so that output
+    # starts before all the rows are in. Column widths are fixed from
+    # the first sample rows; a longer value later on just pushes the
+    # rest of its line.
+    buf = []
+    width = None
+
+    for row in rows:
+        if width is None:
+            buf.append(row)
+
+            if len(buf) >= sample:
+                width = [max(map(lambda x: printlength(x[col]), buf)) for col in range(len(buf[0]))]
+                for i in buf:
+                    printrow(i, width, delimiter)
+        else:
+            printrow(row, width, delimiter)
+
+    if width is None:
+        prettyprint(buf, delimiter)
+
+class KeepAliveMixIn(object):
+    # 2026-10-18 The underlying xmlrpclib transport already keeps its
+    # HTTP/1.1 connection open between calls, as long as the same
+    # transport is reused. Add an optional socket timeout (0 for none,
+    # as calls like dumpwallet or a rescan can take many minutes), and
+    # retries with backoff for a daemon that is refusing connections,
+    # e.g. while restarting. Other errors are not retried, as the call
+    # may already have gone through (think sendtoaddress).
+    def setup(self, timeout, retries):
+        self.timeout = timeout
+        self.retries = retries
+
+    def make_connection(self, host):
+        conn = self.base.make_connection(self, host)
+        if self.timeout > 0:
+            conn.timeout = self.timeout
+        return conn
+
+    def request(self, host, handler, request_body, verbose=0):
+        import errno, socket
+        from time import sleep
+
+        for i in range(self.retries + 1):
+            try:
+                return self.base.request(self, host, handler, request_body, verbose)
+            except socket.error as e:
+                self.close()
+                if i == self.retries or e.errno != errno.ECONNREFUSED:
+                    raise
+                sleep(0.5 * 2**i)
+
+# Transport classes, made on first use
+transports = {}
+
+def keepalive_transport(secure):
+    if len(transports) == 0:
+        # https://github.com/joshmarshall/jsonrpclib
+        from jsonrpclib.jsonrpc import Transport, SafeTransport
+
+        # Explicit base classes, as xmlrpclib transports are old-style
+        # classes in Python 2
+        class KeepAliveTransport(KeepAliveMixIn, Transport):
+            base = Transport
+
+        class SafeKeepAliveTransport(KeepAliveMixIn, SafeTransport):
+            base = SafeTransport
+
+        transports[False] = KeepAliveTransport
+        transports[True] = SafeKeepAliveTransport
+
+    return transports[secure]()
+
+# One server proxy, and hence one open connection, per daemon URL and
+# thread
+rpc_servers = {}
+
+def rpc_server(url, timeout = 0, retries = 2):
+    # 2026-10-18 Shared factory for daemon connections, so that loops
+    # of calls reuse the same keep-alive connection instead of opening
+    # a new one (and maybe a TLS handshake) every time. Connections
+    # are not shared between threads.
+    from threading import current_thread
+
+    key = (url, timeout, retries, current_thread().ident)
+
+    if key not in rpc_servers:
+        from jsonrpclib import Server
+
+        transport = keepalive_transport(url.startswith("https"))
+        transport.setup(timeout, retries)
+
+        rpc_servers[key] = Server(url, transport = transport)
+
+    return rpc_servers[key]
+
+def rpc_batch(server, calls, chunk = 1000, serial = None):
+    # 2026-10-18 Send independent calls as a single JSON-RPC 2.0 batch
+    # POST, instead of one HTTP round trip each. calls is a list of
+    # (method, args) pairs. Results come back in the same order, with
+    # the exception object in place of the result for failed calls,
+    # so the caller can decide which failures matter. Very long lists
+    # are split into batches of chunk calls. Without batch support,
+    # only the first serial calls are made, if given, and the rest are
+    # left as None, for calls that are only worth it in a batch.
+    from jsonrpclib import dumps, ProtocolError
+    import socket
+
+    if len(calls) == 0:
+        return []
+
+    if len(calls) > chunk:
+        results = []
+        for i in range(0, len(calls), chunk):
+            if serial is not None:
+                left = max(serial - i, 0)
+            else:
+                left = None
+            results += rpc_batch(server, calls[i:i + chunk], chunk, left)
+        return results
+
+    body = "[" + ",".join([dumps(list(calls[i][1]), calls[i][0], rpcid=i + 1, version=2.0) for i in range(len(calls))]) + "]"
+
+    try:
+        responses = server._run_request(body)
+    except socket.timeout:
+        # The daemon is not answering at all, so the calls one by one
+        # would only wait longer
+        raise
+    except:
+        responses = None
+
+    if not isinstance(responses, list):
+        # No batch support in this daemon, so do it the slow way
+        results = [None] * len(calls)
+        for i in range(len(calls)):
+            if serial is not None and i >= serial:
+                break
+
+            (method, args) = calls[i]
+            try:
+                results[i] = getattr(server, method)(*args)
+            except Exception as e:
+                results[i] = e
+        return results
+
+    results = [ProtocolError("No response to batched call")] * len(calls)
+
+    # The spec allows any order, so match the responses by id, which
+    # starts from 1 as jsonrpclib replaces a zero id with a random one
+    for r in responses:
+        if not isinstance(r, dict) or r.get("id") not in range(1, len(calls) + 1):
+            continue
+
+        if r.get("error") is not None:
+            results[r["id"] - 1] = ProtocolError((r["error"].get("code"), r["error"].get("message")))
+        else:
+            results[r["id"] - 1] = r.get("result")
+
+    return results
+
+def method_missing(e):
+    # 2026-10-18 True for the JSON-RPC "Method not found" error from
+    # an older daemon, as opposed to a timeout or a failed call
+    from jsonrpclib import ProtocolError
+
+    try:
+        return isinstance(e, ProtocolError) and e.args[0][0] == -32601
+    except (IndexError, TypeError):
+        return False
 
 def timeprint(time):
     # This is used more generally, so provide the number as a number,
@@ -47,57 +231,240 @@ def timeprint(time):
 
     return [time, "s"]
 
-def coin_price(coin, basecur):
+# 2026-10-18 Price cache shared by all the scripts, so that cron runs
+# for several coins do not ask the same prices over and over. Maximum
+# age in seconds from the BITTOOLS_PRICE_TTL environment variable.
+pricecache = os.path.expanduser("~/.bittools/pricecache")
+price_ttl = float(os.environ.get("BITTOOLS_PRICE_TTL", 600))
+
+# In-process copy of the cache, e.g. {"LTC-EUR": [price, unixtime]}
+price_memo = {}
+price_lock = Lock()
+
+def read_pricecache():
+    import json
+
+    try:
+        File = open(pricecache, "r")
+        prices = json.load(File)
+        File.close()
+        return prices
+    except:
+        return {}
+
+def cached_price(cur, basecur):
+    # Price if known and fresh enough, otherwise 0
+    key = cur + "-" + basecur
+
+    if key not in price_memo or time() - price_memo[key][1] > price_ttl:
+        for (k, v) in read_pricecache().items():
+            if k not in price_memo or v[1] > price_memo[k][1]:
+                price_memo[k] = v
+
+    if key in price_memo and time() - price_memo[key][1] <= price_ttl:
+        return price_memo[key][0]
+
+    return 0
+
+def save_price(cur, basecur, price):
+    save_prices({cur + "-" + basecur: price})
+
+def save_prices(prices):
+    # Add prices to the cache, e.g. {"LTC-EUR": price}
+    import json
+
+    for (key, price) in prices.items():
+        price_memo[key] = [price, time()]
+
+    # Other scripts may have added prices in the meantime, so merge
+    # with the file, dropping anything older than a day. Write to a
+    # temp file and rename, so that readers never see a partial file.
+    with price_lock:
+        try:
+            cache = read_pricecache()
+            for (k, v) in list(price_memo.items()):
+                if k not in cache or v[1] > cache[k][1]:
+                    cache[k] = v
+
+            for k in list(cache.keys()):
+                if time() - cache[k][1] > 86400:
+                    del cache[k]
+
+            if not os.path.isdir(os.path.dirname(pricecache)):
+                os.makedirs(os.path.dirname(pricecache))
+
+            tmpfile = pricecache + ".tmp" + str(os.getpid())
+            File = open(tmpfile, "w")
+            json.dump(cache, File)
+            File.close()
+            os.rename(tmpfile, pricecache)
+        except:
+            # The cache is only an optimization
+            pass
+
+def api_price(url, coin, basecur):
+    # Price from one of the APIs in coin_price(), or 0 if this one
+    # fails or is not applicable
     import json
 
     if version_info >= (3, 0):
         from urllib.request import urlopen
     else:
         from urllib2 import urlopen
-        
+
+    cur = registry[coin].ticker
+
+    try:
+        response = urlopen(url, timeout = 5)
+        data = json.loads(response.read())
+
+        # 2024-11-21 Coingecko has incorrect DOGE price
+        if cur != "DOGE" and "coingecko" in url and len(data[cur.lower()]) > 0:
+            return float(data[cur.lower()][basecur.lower()])
+
+        elif "coinmarketcap" in url:
+            if basecur in ["BTC", "USD"]:
+                return float(data[0]["price_" + basecur.lower()])
+            elif "BTC" not in [cur, basecur]:
+                return coin_price_via_btc(coin, basecur)
+
+        elif "cryptonator" in url:
+            return float(data["ticker"]["price"])
+
+        elif "cryptocompare" in url and cur != "BBR":
+            # outdated for BBR
+
+            if "BTC" not in [cur, basecur]:
+                return coin_price_via_btc(coin, basecur)
+            else:
+                return float(data[basecur])
+    except:
+        pass
+
+    return 0
+
+def coin_price(coin, basecur, deadline = 8):
+    from threading import Thread
+
+    if version_info >= (3, 0):
+        from queue import Queue, Empty
+    else:
+        from Queue import Queue, Empty
+
     # 2018-02-18 Coinmarketcap uses full names instead of tickers, and
     # it is easier to map coin->ticker here
-    cur = currency[coin]
-    
+    cur = registry[coin].ticker
+
     if cur == basecur:
         return 1
-    
+
+    price = cached_price(cur, basecur)
+    if price > 0:
+        return price
+
     api_urls = [
         "https://api.coingecko.com/api/v3/simple/price?ids=" + cur + "&vs_currencies=" + basecur,
         "https://api.coinmarketcap.com/v1/ticker/" + coin + "/",
         "https://min-api.cryptocompare.com/data/price?fsym=" + cur + "&tsyms=" + basecur,
         "https://api.cryptonator.com/api/ticker/" + cur + "-" + basecur,
     ]
-    
+
+    # 2026-10-18 Ask all APIs at once and take the first valid answer,
+    # so a slow or dead API does not hold up the others. Daemon
+    # threads, so that any stragglers are simply abandoned instead of
+    # delaying the exit, with an overall deadline in seconds.
+    answers = Queue()
+
     for url in api_urls:
+        t = Thread(target = lambda u: answers.put(api_price(u, coin, basecur)), args = (url,))
+        t.daemon = True
+        t.start()
+
+    endtime = time() + deadline
+
+    for i in range(len(api_urls)):
         try:
-            response = urlopen(url, timeout = 5)
-            data = json.loads(response.read())
+            price = answers.get(timeout = max(endtime - time(), 0))
+        except Empty:
+            break
 
-            # 2024-11-21 Coingecko has incorrect DOGE price
-            if cur != "DOGE" and "coingecko" in url and len(data[cur.lower()]) > 0:
-                return float(data[cur.lower()][basecur.lower()])
-                
-            elif "coinmarketcap" in url:
-                if basecur in ["BTC", "USD"]:
-                    return float(data[0]["price_" + basecur.lower()])
-                elif "BTC" not in [cur, basecur]:
-                    return coin_price_via_btc(coin, basecur)
-            
-            elif "cryptonator" in url:
-                return float(data["ticker"]["price"])
-
-            elif "cryptocompare" in url and cur != "BBR":
-                # outdated for BBR
-
-                if "BTC" not in [cur, basecur]:
-                    return coin_price_via_btc(coin, basecur)
+        if price > 0:
+            save_price(cur, basecur, price)
+            return price
+
+    return 0
+
+def coin_prices(coins, basecurs):
+    # 2026-10-18 Prices for all combinations of the given coins and
+    # base currencies, as a dict indexed by (coin, basecur). Coingecko
+    # takes lists of both, so ask everything not already cached in one
+    # request, and fall back to coin_price() only for the missing
+    # pairs.
+    import json
+    from threading import Thread
+
+    if version_info >= (3, 0):
+        from urllib.request import urlopen
+    else:
+        from urllib2 import urlopen
+
+    prices = {}
+    missing = []
+
+    for coin in coins:
+        cur = registry[coin].ticker
+        for basecur in basecurs:
+            if cur == basecur:
+                prices[(coin, basecur)] = 1
+            else:
+                price = cached_price(cur, basecur)
+                if price > 0:
+                    prices[(coin, basecur)] = price
                 else:
-                    return float(data[basecur])
+                    missing.append((coin, basecur))
+
+    # 2024-11-21 Coingecko has incorrect DOGE price
+    ids = sorted(set([registry[m[0]].ticker for m in missing if registry[m[0]].ticker != "DOGE"]))
+    vs = sorted(set([m[1] for m in missing]))
+
+    if len(ids) > 0:
+        url = "https://api.coingecko.com/api/v3/simple/price?ids=" + ",".join(ids) + "&vs_currencies=" + ",".join(vs)
+
+        try:
+            response = urlopen(url, timeout = 5)
+            data = json.loads(response.read())
         except:
-            pass
+            data = {}
 
-    return 0
+        found = {}
+        for (coin, basecur) in missing:
+            cur = registry[coin].ticker
+            try:
+                price = float(data[cur.lower()][basecur.lower()])
+            except:
+                continue
+
+            if cur != "DOGE" and price > 0:
+                prices[(coin, basecur)] = price
+                found[cur + "-" + basecur] = price
+
+        if len(found) > 0:
+            save_prices(found)
+
+    # The rest one by one, but in parallel. Each coin_price() has its
+    # own deadline.
+    threads = []
+    for pair in missing:
+        if pair not in prices:
+            t = Thread(target = lambda p: prices.__setitem__(p, coin_price(*p)), args = (pair,))
+            t.daemon = True
+            t.start()
+            threads.append(t)
+
+    for t in threads:
+        t.join()
+
+    return prices
 
 def coin_price_via_btc(coin, basecur):
     # Common issue for price APIs, so factor out
@@ -107,20 +474,51 @@ def coin_price_via_btc(coin, basecur):
 
 def linear_regression(pairs):
     # Data usually comes in x, y pairs, so choose it as my input format
-    
-    # There should be something clever with zip() etc. but I can't
-    # get it working now :-/
-    xy = [[], []]
+
+    # 2026-10-18 Vectorized with NumPy for large inputs, if
+    # available; importing NumPy takes longer than a few hundred
+    # samples in plain Python. Otherwise a single pass for all sums.
+    # In both cases x is taken relative to the first sample, as the
+    # sums of squared unix times lose too many digits.
+    x0 = float(pairs[0][0])
+
+    if len(pairs) >= 1000:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        if numpy is not None:
+            xy = numpy.array(pairs, dtype = float)
+            x = xy[:, 0] - x0
+            y = xy[:, 1]
+
+            (a, b) = regression_sums(len(x), float(x.sum()), float(y.sum()), float(x.dot(x)), float(x.dot(y)))
+
+            return (a - b*x0, b)
+
+    n = 0
+    sx = 0.
+    sy = 0.
+    sx2 = 0.
+    sxy = 0.
+
     for p in pairs:
-        for i in [0, 1]:
-            xy[i].append(float(p[i]))
+        x = float(p[0]) - x0
+        y = float(p[1])
+
+        n += 1
+        sx += x
+        sy += y
+        sx2 += x**2
+        sxy += x*y
+
+    (a, b) = regression_sums(n, sx, sy, sx2, sxy)
+
+    return (a - b*x0, b)
 
-    n = len(xy[0])
-    sx = sum(xy[0])
-    sy = sum(xy[1])
-    sx2 = sum(map(lambda z: z**2, xy[0]))
-    sy2 = sum(map(lambda z: z**2, xy[1]))
-    sxy = sum(map(lambda a, b: a*b, xy[0], xy[1]))
+def regression_sums(n, sx, sy, sx2, sxy):
+    # 2026-10-18 Separated for running sums
 
     # Repeating data points may induce div by zero
     if n*sx2 != sx**2:
@@ -134,8 +532,138 @@ def linear_regression(pairs):
 
     return (a, b)
 
-def meandiff(coin, diffnow = 0):
-    # Use meandiff.sh history if available
+# 2026-10-18 Local store of recent block headers, so that chain
+# statistics need not fetch the same blocks on every run. One line per
+# block in ~/.<coin>/headers:
+#
+# height hash time difficulty flags mint
+#
+# where flags is the PoW/PoS flag of the block, - if the block has
+# none, or ? if only the header was fetched and the flag is unknown.
+
+# Don't keep anything older than this many blocks below the tip
+headers_keep = 10000
+
+# In-process copy of the store, {coin: (tip, headers)}
+headers_memo = {}
+
+def read_headers(coin):
+    headers = {}
+
+    try:
+        for line in ReadLines(coindir(coin) + "/headers"):
+            f = line.split()
+            if len(f) == 6:
+                headers[int(f[0])] = [f[1], int(f[2]), float(f[3]), f[4], float(f[5])]
+    except:
+        pass
+
+    return headers
+
+def write_headers(coin, headers):
+    headerfile = coindir(coin) + "/headers"
+    tmpfile = headerfile + ".tmp" + str(os.getpid())
+
+    try:
+        File = open(tmpfile, "w")
+        for height in sorted(headers.keys()):
+            File.write("%i %s %i %r %s %r\n" % tuple([height] + headers[height]))
+        File.close()
+        os.rename(tmpfile, headerfile)
+    except:
+        # Only a cache
+        pass
+
+def header_record(b, full):
+    if full:
+        flags = b.get("flags", "-")
+    else:
+        flags = b.get("flags", "?")
+
+    return [b["hash"], int(b["time"]), float(b["difficulty"]), flags.replace(" ", "-"), float(b.get("mint", 0))]
+
+def chain_headers(server, coin, tip, heights, full = False):
+    # Header records for the given heights, as a dict indexed by
+    # height. Anything not in the store is fetched in batches, using
+    # full blocks if flags and mint are needed.
+    changed = False
+
+    # Already read and checked against this tip in this process
+    checked = coin in headers_memo and headers_memo[coin][0] == tip
+
+    if checked:
+        headers = headers_memo[coin][1]
+    else:
+        headers = read_headers(coin)
+
+        # Anything above the current tip is from a stale chain
+        for height in list(headers.keys()):
+            if height > tip or height < tip - headers_keep:
+                del headers[height]
+                changed = True
+
+    heights = [h for h in heights if 0 <= h <= tip]
+
+    while True:
+        missing = [h for h in heights if h not in headers or (full and headers[h][3] == "?")]
+
+        # Check for reorgs in the same batch: if the top block in the
+        # store is still on the chain, so are all the ones below it.
+        if checked:
+            cached = []
+        else:
+            cached = sorted(headers.keys(), reverse = True)[:1]
+
+        hashes = rpc_batch(server, [("getblockhash", [h]) for h in missing + cached])
+
+        if len(cached) == 0 or hashes[-1] == headers[cached[0]][0]:
+            break
+
+        cached = sorted(headers.keys(), reverse = True)
+
+        # Reorg, so walk back until the store agrees with the chain
+        checks = rpc_batch(server, [("getblockhash", [h]) for h in cached[:100]])
+        for i in range(len(checks)):
+            if checks[i] == headers[cached[i]][0]:
+                break
+            del headers[cached[i]]
+        else:
+            headers = {}
+
+        changed = True
+
+    hashes = hashes[:len(missing)]
+    fetch = [i for i in range(len(missing)) if not isinstance(hashes[i], Exception)]
+
+    if full:
+        blocks = rpc_batch(server, [("getblock", [hashes[i]]) for i in fetch])
+    else:
+        blocks = rpc_batch(server, [("getblockheader", [hashes[i]]) for i in fetch])
+
+        # Older daemons have no getblockheader
+        if len(blocks) > 0 and isinstance(blocks[0], Exception):
+            blocks = rpc_batch(server, [("getblock", [hashes[i]]) for i in fetch])
+            full = True
+
+    for j in range(len(fetch)):
+        if not isinstance(blocks[j], Exception):
+            headers[missing[fetch[j]]] = header_record(blocks[j], full)
+            changed = True
+
+    if changed:
+        write_headers(coin, headers)
+
+    headers_memo[coin] = (tip, headers)
+
+    result = {}
+    for h in heights:
+        if h in headers:
+            result[h] = headers[h]
+
+    return result
+
+def coindir(coin):
+    # Data directory, as used by meandiff.sh
     if coin == "boolberry":
         dirname = "boolb"
     elif coin == "monero":
@@ -144,33 +672,438 @@ def meandiff(coin, diffnow = 0):
         dirname = "Zano"
     else:
         dirname = coin
-        
-    difflog = os.path.expanduser("~/." + dirname + "/difflog")
+
+    return os.path.expanduser("~/." + dirname)
+
+# 2026-10-18 Binary difficulty history in ~/.<coin>/diffhist, as
+# fixed records of int64 unix time and float64 difficulty, sorted by
+# time. Unlike the difflog, this is never pruned. Dupes are dropped
+# on write, and readers map the file and slice it without copying.
+diffhist_record = Struct("<qd")
+
+def diffhist_append(histfile, pairs):
+    # Append (time, diff) pairs newer than the last record; returns
+    # the number of records written
+    size = diffhist_record.size
+    last = None
+
+    try:
+        File = open(histfile, "rb")
+        File.seek(0, 2)
+        end = File.tell() - File.tell() % size
+        if end > 0:
+            File.seek(end - size)
+            last = diffhist_record.unpack(File.read(size))[0]
+        File.close()
+    except:
+        end = 0
+
+    records = []
+    for p in sorted(pairs):
+        t = int(p[0])
+        if p[1] > 0 and (last is None or t > last):
+            records.append(diffhist_record.pack(t, p[1]))
+            last = t
+
+    if len(records) > 0:
+        File = open(histfile, "ab")
+
+        # Cut off any partial record from an interrupted write
+        File.truncate(end)
+        File.write(b"".join(records))
+        File.close()
+
+    return len(records)
+
+def diffhist_map(histfile):
+    # Read-only map of the store, or None if empty
+    from mmap import mmap, ACCESS_READ
+
+    File = open(histfile, "rb")
+    try:
+        mm = mmap(File.fileno(), 0, access = ACCESS_READ)
+    except ValueError:
+        mm = None
+    File.close()
+
+    return mm
+
+def diffhist_index(mm, t):
+    # Index of the first record at or after time t
+    size = diffhist_record.size
+    lo = 0
+    hi = len(mm) // size
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if diffhist_record.unpack_from(mm, mid * size)[0] < t:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+def diffhist_slice(mm, start = 0, end = None):
+    # Records with start <= time < end, as a view on the map
+    size = diffhist_record.size
+
+    i = diffhist_index(mm, start)
+    if end is None:
+        j = len(mm) // size
+    else:
+        j = diffhist_index(mm, end)
+
+    return memoryview(mm)[i * size:j * size]
+
+def diffhist_pairs(view):
+    size = diffhist_record.size
+    for k in range(len(view) // size):
+        yield diffhist_record.unpack_from(view, k * size)
+
+# 2026-10-18 Difficulty estimators for meandiff(), each keeping its
+# state in a small binary sidecar next to the difflog, so that only
+# newly appended lines need to be parsed. All states begin with a
+# checksum of the first line, the model parameter and the head byte
+# offset, and hold the last pair read there. meandiff.sh and sampler.py
+# prune by rewriting the log, often into the inode of the one before,
+# so the state is only used if the first line is the same and the
+# last pair read still ends at the offset. Times are taken relative
+# to the first sample x0, to keep the sums small.
+
+# Sliding-window OLS, in <log>.sums for the whole log or
+# <log>.sums-<window>. Fields after the header: tail offset, x0, n,
+# sx, sy, sx2, sy2, sxy, and the last pairs read at the head and the
+# tail, for skipping dupes.
+difflog_sums = Struct("<4Q11d")
+
+# Exponentially weighted regression, in <log>.ewls-<halflife>.
+# Fields after the header: x0, time of the last sample, then the
+# weighted sums W, sx, sy, sx2, sxy, and the last pair read.
+difflog_ewls = Struct("<3Q9d")
+
+def difflog_pair(line):
+    f = line.split()
+    try:
+        return (float(f[0]), float(f[1]))
+    except:
+        return None
+
+def difflog_checksum(File, binary = False):
+    # Of the first line or record, which changes when the log is pruned
+    from zlib import crc32
+
+    File.seek(0)
+    if binary:
+        head = File.read(diffhist_record.size)
+    else:
+        head = File.readline()
+
+    return crc32(head) & 0xffffffff
+
+def difflog_last(File, offset, binary = False):
+    # The pair that ends at offset, None if there is no such
+    if binary:
+        size = diffhist_record.size
+        if offset < size or offset % size != 0:
+            return None
+
+        File.seek(offset - size)
+        return diffhist_record.unpack(File.read(size))
+
+    start = max(offset - 256, 0)
+    File.seek(start)
+    data = File.read(offset - start)
+
+    if not data.endswith(b"\n"):
+        return None
+
+    return difflog_pair(data[:-1].split(b"\n")[-1])
+
+def difflog_resume(File, after, binary = False):
+    # Offset of the first pair newer than after, as the log is sorted
+    File.seek(0)
+    offset = 0
+
+    if binary:
+        size = diffhist_record.size
+        for record in iter(lambda: File.read(size), b""):
+            if len(record) < size or diffhist_record.unpack(record)[0] > after:
+                break
+            offset += size
+
+        return offset
+
+    for line in File:
+        p = difflog_pair(line)
+        if not line.endswith(b"\n") or p is not None and p[0] > after:
+            break
+        offset += len(line)
+
+    return offset
+
+def read_sums(sumsfile, fmt, File, param, last, binary = False, resume = False):
+    # The stored state if it still matches the log; last is the index
+    # of the last pair read in the state. With resume, a state that
+    # does not match goes on from the first newer pair in the log,
+    # for models that keep the pruned samples anyway.
+    try:
+        SumsFile = open(sumsfile, "rb")
+        state = list(fmt.unpack(SumsFile.read()))
+        SumsFile.close()
+    except:
+        return None
+
+    if state[1] != param:
+        return None
+
+    checksum = difflog_checksum(File, binary)
+
+    if state[0] == checksum and state[2] <= os.fstat(File.fileno()).st_size:
+        if state[2] == 0 or difflog_last(File, state[2], binary) == tuple(state[last:last+2]):
+            return state
+
+    if resume and state[last] == state[last]:
+        state[0] = checksum
+        state[2] = difflog_resume(File, state[last], binary)
+        return state
+
+    return None
+
+def write_sums(sumsfile, fmt, state):
+    tmpfile = sumsfile + ".tmp" + str(os.getpid())
+
+    try:
+        File = open(tmpfile, "wb")
+        File.write(fmt.pack(*state))
+        File.close()
+        os.rename(tmpfile, sumsfile)
+    except:
+        # Only a cache
+        pass
+
+def difflog_new(File, offset, binary = False):
+    # Pairs from the complete lines or records after offset, and the
+    # new offset; a partial one is picked up next time
+    File.seek(offset)
+    data = File.read()
+
+    if binary:
+        end = len(data) - len(data) % diffhist_record.size
+        return (list(diffhist_pairs(memoryview(data)[:end])), offset + end)
+
+    end = data.rfind(b"\n") + 1
+
+    pairs = [difflog_pair(line) for line in data[:end].splitlines()]
+
+    return ([p for p in pairs if p is not None], offset + end)
+
+def difflog_add(state, p, sign):
+    x = p[0] - state[4]
+    y = p[1]
+
+    state[5] += sign
+    state[6] += sign * x
+    state[7] += sign * y
+    state[8] += sign * x**2
+    state[9] += sign * y**2
+    state[10] += sign * x*y
+
+def difflog_state(difflog, window = 0, binary = False):
+    if window > 0:
+        sumsfile = difflog + ".sums-" + str(window)
+    else:
+        sumsfile = difflog + ".sums"
+
+    File = open(difflog, "rb")
+    state = read_sums(sumsfile, difflog_sums, File, window, 11, binary)
+
+    if state is None:
+        nan = float("nan")
+        state = [difflog_checksum(File, binary), window, 0, 0, nan, 0, 0., 0., 0., 0., 0., nan, nan, nan, nan]
+
+    old = list(state)
+
+    (pairs, state[2]) = difflog_new(File, state[2], binary)
+
+    for p in pairs:
+        # The log is sorted, so the dupes are adjacent, as in uniq
+        if p == (state[11], state[12]):
+            continue
+
+        if state[4] != state[4]:
+            state[4] = p[0]
+
+        difflog_add(state, p, 1)
+        state[11:13] = p
+
+    if window > 0:
+        # Drop the samples that have fallen out of the window, walking
+        # the same lines from the tail
+        cutoff = time() - window
+        File.seek(state[3])
+
+        while state[3] < state[2]:
+            if binary:
+                p = diffhist_record.unpack(File.read(diffhist_record.size))
+            else:
+                p = difflog_pair(File.readline())
+
+            if p is not None and p != (state[13], state[14]):
+                if p[0] >= cutoff:
+                    break
+
+                difflog_add(state, p, -1)
+                state[13:15] = p
+
+            state[3] = File.tell()
+
+    File.close()
+
+    if state != old:
+        write_sums(sumsfile, difflog_sums, state)
+
+    return state
+
+def ewls_decay(state, x, halflife):
+    # Age the weighted sums to time x
+    d = 0.5 ** ((x - state[4]) / halflife)
+
+    for i in range(5, 10):
+        state[i] *= d
+
+    state[4] = x
+
+def ewls_add(state, p, halflife):
+    x = p[0] - state[3]
+    y = p[1]
+
+    ewls_decay(state, x, halflife)
+
+    state[5] += 1
+    state[6] += x
+    state[7] += y
+    state[8] += x**2
+    state[9] += x*y
+
+def ewls_state(difflog, halflife, binary = False):
+    sumsfile = difflog + ".ewls-" + str(halflife)
+
+    File = open(difflog, "rb")
+    # The weights fade the old samples out, so the state carries over
+    # when the log is pruned
+    state = read_sums(sumsfile, difflog_ewls, File, halflife, 10, binary, True)
+
+    if state is None:
+        nan = float("nan")
+        state = [difflog_checksum(File, binary), halflife, 0, nan, 0., 0., 0., 0., 0., 0., nan, nan]
+
+    old = list(state)
+
+    (pairs, state[2]) = difflog_new(File, state[2], binary)
+    File.close()
+
+    for p in pairs:
+        if p == (state[10], state[11]):
+            continue
+
+        if state[3] != state[3]:
+            state[3] = p[0]
+
+        ewls_add(state, p, halflife)
+        state[10:12] = p
+
+    if state != old:
+        write_sums(sumsfile, difflog_ewls, state)
+
+    return state
+
+def meandiff(coin, diffnow = 0, window = 0, model = "ols", halflife = 86400, retarget = 0, nextretarget = 0):
+    # Use meandiff.sh history if available
+    difflog = coindir(coin) + "/difflog"
+
+    # 2026-10-18 Selectable models, all from stored running sums: ols
+    # over the whole log or the last window seconds; ewls with weights
+    # halving every halflife seconds; retarget for coins with fixed
+    # retarget intervals of retarget seconds, the next one due in
+    # nextretarget seconds.
+    if model == "retarget" and retarget > 0:
+        if window <= 0:
+            # A few retargets for the trend
+            window = 4 * retarget
+    elif model != "ewls":
+        model = "ols"
+
+    # 2026-10-18 The binary history is never pruned, so prefer it
+    # only when the model limits the history by itself
+    diffhist = coindir(coin) + "/diffhist"
+    binary = (model == "ewls" or window > 0) and os.path.exists(diffhist) and time() - os.path.getmtime(diffhist) < 1e4
+    if binary:
+        difflog = diffhist
 
     # Don't use if more than a few hours old
     if os.path.exists(difflog) and time() - os.path.getmtime(difflog) < 1e4:
-        # unique lines
-        l = set(ReadLines(difflog))
-
         # Meandiff was originally about smoothing random
         # variations. However, if the diff is obviously
         # increasing/decreasing, use that for prediction. If not, this
         # performs the smoothing anyway.
 
-        if len(l) < 2:
-            return 0
-        
-        # difflog now contains time, diff pairs
-        pairs = list(map(lambda a: a.split(), l))
+        now = time()
+
+        try:
+            if model == "ewls":
+                state = ewls_state(difflog, int(halflife), binary)
 
-        # Current difficulty is a valid, useful data point
-        if diffnow > 0:
-            pairs.append([time(), diffnow])
+                # Only one sample so far
+                if state[4] <= 0:
+                    return 0
 
-        ab = linear_regression(pairs)
+                if diffnow > 0:
+                    # Current difficulty is a valid, useful data point
+                    ewls_add(state, (now, diffnow), halflife)
+                else:
+                    ewls_decay(state, now - state[3], halflife)
+
+                x0 = state[3]
+                (n, sx, sy, sx2, sxy) = state[5:10]
+            else:
+                state = difflog_state(difflog, int(window), binary)
+
+                (x0, n, sx, sy, sx2, sy2, sxy) = state[4:11]
+
+                if n < 2:
+                    return 0
+
+                if diffnow > 0 and model == "ols":
+                    x = now - x0
+                    n += 1
+                    sx += x
+                    sy += diffnow
+                    sx2 += x**2
+                    sxy += x * diffnow
+        except:
+            return 0
+
+        ab = regression_sums(n, sx, sy, sx2, sxy)
 
         # Estimate a current diff
-        return ab[0] + ab[1] * time()
+        estimate = ab[0] + ab[1] * (now - x0)
+
+        if model == "retarget":
+            # The difficulty stays put until the next retarget, and
+            # then follows the trend. Average over one interval from
+            # now.
+            nextretarget = min(max(nextretarget, 0), retarget)
+
+            if diffnow > 0:
+                current = diffnow
+            else:
+                current = estimate
+
+            after = ab[0] + ab[1] * (now + nextretarget - x0)
+
+            estimate = (nextretarget * current + (retarget - nextretarget) * after) / retarget
+
+        return estimate
     else:
         return 0
 
@@ -181,7 +1114,7 @@ def profit(blocktime, reward, coin, watts, kwhprice, fiatprice = 0, basecur = "E
     
     output = []
 
-    cur = currency[coin]
+    cur = registry[coin].ticker
     
     tp = timeprint(blocktime)
     output.append(["\nAverage time between blocks", str(tp[0]) + " " + tp[1]])
@@ -223,9 +1156,94 @@ def profit(blocktime, reward, coin, watts, kwhprice, fiatprice = 0, basecur = "E
 
     return output
 
-def exp_decay(init, blocks, period, base=0.5):
-    p = ceil(float(blocks) / float(period - 2))
-    return init * base**(p - 1)
+def sweep_values(spec):
+    # 2026-10-18 "start:stop:n" for n evenly spaced values from start
+    # to stop, or a comma separated list of values
+    if ":" in spec:
+        (start, stop, n) = spec.split(":")
+        (start, stop, n) = (float(start), float(stop), int(n))
+
+        if n < 2:
+            return [start]
+
+        return [start + (stop - start) * i / (n - 1.) for i in range(n)]
+
+    return [float(x) for x in spec.split(",")]
+
+def profit_grid(blocktimes, rewards, prices, watts, kwhprices):
+    # 2026-10-18 profit() for a whole grid at once, for capacity
+    # planning. blocktimes is an array of (difficulty, hashrate), with
+    # one block reward for each difficulty. The results are arrays of
+    # (difficulty, coin price, hashrate, watts, kWh price), as far as
+    # they depend on these.
+    import numpy
+
+    blocktimes = numpy.asarray(blocktimes, dtype = float)
+    rewards = numpy.asarray(rewards, dtype = float)
+    prices = numpy.asarray(prices, dtype = float)
+    watts = numpy.asarray(watts, dtype = float)
+    kwhprices = numpy.asarray(kwhprices, dtype = float)
+
+    grid = {}
+
+    grid["coinsperday"] = (rewards[:, None] / blocktimes * 86400)[:, None, :, None, None]
+    grid["fiatpay"] = grid["coinsperday"] * prices[None, :, None, None, None]
+
+    kwhperday = watts / 1000 * 24
+    grid["cost"] = (kwhperday[:, None] * kwhprices[None, :])[None, None, None, :, :]
+    grid["net"] = grid["fiatpay"] - grid["cost"]
+
+    # The kWh price where net profit goes to zero, for each of the
+    # other parameters
+    with numpy.errstate(divide = "ignore", invalid = "ignore"):
+        kwhperday = kwhperday[None, None, None, :, None]
+        grid["breakeven"] = numpy.where(kwhperday > 0, grid["fiatpay"] / kwhperday, numpy.inf)
+
+    return grid
+
+def emission_report(coin, blocks, years = 10):
+    # 2026-10-18 Supply curve of the coin's emission schedule, at each
+    # halving or other reward step, with the estimated time to those
+    # still ahead. Schedules without a closed form are followed for
+    # the given number of years ahead. Rewards from the difficulty
+    # have no such schedule.
+    c = registry[coin]
+    s = c.emission
+
+    if s is None or isinstance(s, Formula) and s.segments is None:
+        return []
+
+    end = max(2 * blocks, blocks + int(c.blocksperhour * 24 * 365 * years))
+
+    heights = sorted(set(s.milestones(end) + [blocks]))
+
+    rewards = s.rewards(0, heights)
+    (totals, final_total) = s.supplies(heights)
+
+    output = [["Block", "Reward", "Supply", "% of final", "Time"]]
+
+    for i in range(len(heights)):
+        line = [str(heights[i]), str(rewards[i]), str(totals[i])]
+
+        if final_total > 0:
+            line.append("%.4f" % (100 * totals[i] / final_total))
+        else:
+            line.append("-")
+
+        if heights[i] == blocks:
+            line.append("now")
+        elif heights[i] > blocks and c.blocksperhour > 0:
+            tp = timeprint((heights[i] - blocks) * 3600. / c.blocksperhour)
+            line.append("%.1f %s" % (tp[0], tp[1]))
+        else:
+            line.append("-")
+
+        output.append(line)
+
+    if final_total > 0:
+        output.append(["ever", "0", str(final_total), "100", "-"])
+
+    return output
 
 if version_info >= (3, 0):
     # input() is available in python2, but it's more like eval()
@@ -245,54 +1263,87 @@ def confirm():
 
     return c_input == conf
     
-# These need to be available for coin_price so moved here
-currency = {
-    "AuroraCoin": "AUR",
-    "bitcoin": "BTC",
-    "bitcoincash": "BCH",
-    "bitcoin-sv": "BSV",
-    "btcprivate": "BTCP",
-    "blakebitcoin": "BBTC",
-    "blakecoin": "BLC",
-    "chncoin": "CNC",
-    "cryptonite": "XCN",
-    "dash": "DASH",
-    "dirac": "XDQ",
-    "dogecoin": "DOGE",
-    "ecoin": "ECN",
-    "electron": "ELT",
-    "ExclusiveCoin": "EXCL",
-    "groestlcoin": "GRS",
-    "gapcoin": "GAP",
-    "litecoin": "LTC",
-    "lithium": "LIT",
-    "maxcoin": "MAX",
-    "namecoin": "NMC",
-    "photon": "PHO",
-    "patchcoin": "PTC",
-    "peercoin": "PPC",
-    "primecoin": "XPM",
-    "primio": "Primio",
-    "riecoin": "RIC",
-    "ShibeCoin": "Shibe",
-    "skeincoin": "SKC",
-    "Slothcoin": "Sloth",
-    "TjcoinV2": "TJC",
-    "universalmolecule": "UMO",
-    "Vcash": "XVC",
-    "vertcoin": "VTC",
-    "virtacoin": "VTA",
-    "zano": "ZANO", # ?
-    "zcash": "ZEC",
-    "zclassic": "ZCL",
-    "firo": "FIRO", # Formerly Zcoin XZC
-    "zen": "ZEN",
-
-    "aeon": "AEON",
-    "boolberry": "BBR",
-    "monero": "XMR",
-
-    "ethereum": "ETH",
-    "ethereum-classic": "ETC",
-    "ethereumpow": "ETHW",
-}
+def parse_config(conffile):
+    # config file parsing shamelessly adapted from jgarzik's pyminer, as
+    # Python's configparser insists on having sections
+
+    # teknohog changed this from search to match, as the simpler
+    # version is enough here.
+
+    settings = {}
+    config = ReadLines(os.path.expanduser(conffile))
+    for line in config:
+        # skip comment lines
+        m = re.match(r'\s*#', line)
+        if m:
+            continue
+        
+        # parse key=value lines                                         
+        m = re.match(r'(\w+)\s*=\s*(\S.*)$', line)
+        if m is None:
+            continue
+        settings[m.group(1)] = m.group(2)
+
+    return settings
+
+def coin_url(coin):
+    # Local daemon URL, for Bitcoin-like coins with credentials from
+    # the coin's config file
+    c = registry[coin]
+
+    if c.url is not None:
+        return c.url
+
+    if c.family == "cryptonote":
+        return "http://127.0.0.1:" + c.port + "/json_rpc"
+
+    settings = parse_config("~/." + c.confdir + "/" + c.confdir + ".conf")
+
+    # Use default port numbers
+    if not 'rpcport' in settings.keys():
+        settings['rpcport'] = c.port
+
+    return "http://" + settings['rpcuser'] + ":" + settings['rpcpassword'] + "@127.0.0.1:" + settings['rpcport'] + "/"
+
+def startup_time(args, runs = 10):
+    # Best wall time of a command, with bytecode cached as usual
+    import subprocess
+
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    devnull = open(os.devnull, "w")
+    best = None
+    for i in range(runs):
+        t = time()
+        subprocess.call(args, stdout = devnull, stderr = devnull, env = env)
+        t = time() - t
+        if best is None or t < best:
+            best = t
+    devnull.close()
+
+    return best
+
+# 2026-10-18 Startup budget: the offline paths of coinfo.py, such as
+# -h, may take this many seconds more than a bare interpreter, and
+# must not load jsonrpclib
+startup_budget = 0.05
+
+if __name__ == "__main__":
+    # python bittools.py checks the budget
+    from sys import executable
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    bare = startup_time([executable, "-c", "pass"])
+    helptime = startup_time([executable, os.path.join(here, "coinfo.py"), "-h"])
+
+    print("coinfo.py -h: %.1f ms, bare interpreter %.1f ms, budget %.1f ms" % (helptime * 1000, bare * 1000, (bare + startup_budget) * 1000))
+
+    failed = helptime - bare > startup_budget
+
+    import subprocess
+    if subprocess.call([executable, "-c", "import sys; sys.path.insert(0, %r); import bittools; sys.exit('jsonrpclib' in sys.modules)" % here]) != 0:
+        print("bittools loads jsonrpclib at import")
+        failed = True
+
+    exit(failed)
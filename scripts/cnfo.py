@@ -30,12 +30,12 @@ def send(wallet, options):
 
     # List of address+amount pairs. Remember to use number of base
     # units for amount and fee, with integer type.
-    dest = [{"address": address, "amount": int(amount/baseunit[options.coin])}]
+    dest = [{"address": address, "amount": int(amount/coin.baseunit)}]
     
-    print("About to send %s %f to %s with txfee %f and mixin %i" % (currency[options.coin], amount, address, txfee, mixin))
+    print("About to send %s %f to %s with txfee %f and mixin %i" % (coin.ticker, amount, address, txfee, mixin))
     
     if confirm():
-        result = wallet.transfer(destinations = dest, fee = int(txfee/baseunit[options.coin]), mixin = mixin)
+        result = wallet.transfer(destinations = dest, fee = int(txfee/coin.baseunit), mixin = mixin)
         print(result)
     else:
         print("Confirmation failed, not sending.")
@@ -51,28 +51,38 @@ parser.add_argument("--boolberry", action="store_const", const="boolberry", dest
 
 parser.add_argument("-d", "--diff", type=float, default = 0, help="Set difficulty manually for mining estimation")
 
+parser.add_argument("--halflife", type = float, default = 24, help="Hours for the weights to halve in --model ewls, default %(default)s")
+
 parser.add_argument("--listaliases", const = "listaliases", action="store_const", help="List all BBR aliases")
 
 parser.add_argument("-M", "--monero", action="store_const", const="monero", dest="coin", default="boolberry", help="Connect to Monero daemon")
 
 parser.add_argument("--mixin", type = int, default = 2, help="Mixin count for transfer, default %(default)s")
 
+parser.add_argument("--model", choices = ["ols", "ewls"], default = "ols", help="Meandiff estimator: ols for linear regression (default), ewls for exponentially weighted regression")
+
 parser.add_argument("-N", "--zano", action="store_const", const="zano", dest="coin", default="boolberry", help="Connect to Zano daemon")
 
 parser.add_argument("-r", "--hashrate", dest="hashrate", type=float, default = 0, help="Hashes/sec from external miners")
 
+parser.add_argument("--retries", type = int, default = 2, help="Retries when the daemon refuses connections, default %(default)s")
+
 parser.add_argument("-S", "--stake", dest="stake", type=float, default = 0, help="Stake amount for PoS mining estimation")
 
 parser.add_argument("-s", "--sendto", nargs = 2, help = "Send coins: address followed by amount")
 
 parser.add_argument("-t", "--transactions", dest="transactions", type = int, nargs = "?", const = 10, help="List the number of recent transactions, default 10")
 
+parser.add_argument("--timeout", type = float, default = 0, help="Timeout in seconds for daemon calls, default none")
+
 parser.add_argument("--txfee", type = float, default = 0.01, help="Transfer fee, default %(default)s")
 
 parser.add_argument("-u", "--url", dest="url", default="", help="Connect to a different URL, instead of your local daemon")
 
 parser.add_argument("-v", "--verbose", action = "store_true")
 
+parser.add_argument("--window", type = float, default = 0, help="Use only the last hours of the meandiff.sh log, default all")
+
 parser.add_argument("-W", "--watts", dest="watts", type=float, default = 0, help="Power usage of miners for profitability calculation")
 
 parser.add_argument("-w", "--kwhprice", dest="kwhprice", type=float, default = 0, help="kWh price for profitability calculation")
@@ -81,33 +91,14 @@ parser.add_argument("--walletport", type=int, default = 0, help="Connect to wall
 
 options = parser.parse_args()
 
-# Atomic unit of currency
-baseunit = {
-    "aeon": 1e-12,
-    "boolberry": 1e-12,
-    "monero": 1e-12,
-    "zano": 1e-12, # ?
-}
-
-reward_divisor = {
-    "aeon": 2**18,
-    "boolberry": 2**20,
-    "monero": 2**20,
-    "zano": 2**20, # ?
-}
-
-# 2020-08-11 Wallet ports may vary much more, so specify daemon ports only
-rpcport = {
-    "aeon": "11181",
-    "boolberry": "10102",
-    "monero": "18081",
-    "zano": "11211",
-}
+# 2026-10-18 Atomic unit of currency, reward divisor etc. from
+# coins.py
+coin = registry[options.coin]
 
 if options.walletport > 0:
     # 2020-08-11 
     url = "http://127.0.0.1:%i/json_rpc" % options.walletport
-    wallet = Server(url)
+    wallet = rpc_server(url, options.timeout, options.retries)
     
     # method not found
     #print(wallet.get_transfers())
@@ -138,7 +129,7 @@ if options.walletport > 0:
             else:
                 t = "Send"
 
-            txitem = [str(ctime(tx["timestamp"])), t, str(baseunit[options.coin]*tx["amount"])]
+            txitem = [str(ctime(tx["timestamp"])), t, str(coin.baseunit*tx["amount"])]
 
             if options.verbose:
                 txitem.append(tx["tx_hash"])
@@ -150,7 +141,7 @@ if options.walletport > 0:
     else:
         # Address and balance are good defaults to show in any case
         print("Address: %s" % wallet.getaddress()['address'])
-        print("Balance: %f" % (wallet.getbalance()['balance'] * baseunit[options.coin]))
+        print("Balance: %f" % (wallet.getbalance()['balance'] * coin.baseunit))
 
         if options.verbose:
             print("Wallet info: %s" % wallet.get_wallet_info())
@@ -161,10 +152,10 @@ if options.walletport > 0:
 if len(options.url) > 0:
     url = options.url
 else:
-    url = "http://127.0.0.1:" + rpcport[options.coin] + "/json_rpc"
+    url = coin_url(options.coin)
 
 # https://wiki.bytecoin.org/wiki/Daemon_JSON_RPC_API
-daemon = Server(url)
+daemon = rpc_server(url, options.timeout, options.retries)
 
 if options.listaliases:
     aad = daemon.get_all_alias_details()
@@ -199,7 +190,7 @@ if options.coin == "zano":
     # PoW reward for mining calculations. Lasthead may contain much higher PoS
     blockreward = 1
 else:
-    blockreward = lasthead["reward"] * baseunit[options.coin]
+    blockreward = lasthead["reward"] * coin.baseunit
 
 output.append(["blockreward", str(blockreward)])
 
@@ -221,7 +212,7 @@ else:
     
 output.append(["difficulty", str(diff)])
 
-md = meandiff(options.coin, diff)
+md = meandiff(options.coin, diff, options.window * 3600, options.model, options.halflife * 3600)
 if md > 0:
     output.append(["meandiff", str(md)])
 
@@ -232,7 +223,7 @@ if options.coin == "zano":
 else:
     # This is the basic Cryptonote scheme, so it won't work if there's
     # tail emission or something. Also, it's only an estimate.
-    moneysupply = (2**64 - 1) * baseunit[options.coin] - blockreward * reward_divisor[options.coin]
+    moneysupply = (2**64 - 1) * coin.baseunit - blockreward * coin.divisor
 
 output.append(["moneysupply", str(moneysupply)])
 
@@ -246,7 +237,7 @@ if options.hashrate > 0:
     if md > 0 and not options.diff:
         diff = md
     
-    blocktime = diff / options.hashrate
+    blocktime = mining_blocktime(options.coin, diff, options.hashrate)
     output += profit(blocktime, blockreward, options.coin, options.watts, options.kwhprice, 0, options.basecur)
 elif options.stake > 0 and options.coin == "zano":
     # PoS mining estimation. Can use default 0 for watts and kwhprice.
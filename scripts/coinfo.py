@@ -16,74 +16,62 @@
 
 from bittools import *
 
+from itertools import chain
 from optparse import OptionParser
-import re
 
-def staired_reward(blocks, reward_stairs):
-    (limits, rewards) = reward_stairs
+def lastreward(blocks, window = 50):
+    # Use the last block reward as an estimate, need to check for PoW,
+    # should work for several coins. Don't wind back too much in case
+    # of PoS only.
 
-    for i in range(len(limits)):
-        if blocks < limits[i]:
-            return rewards[i-1]
+    # 2026-10-18 Walk back in batched windows via the header store,
+    # stopping at the first PoW block. The default getblock verbosity
+    # already leaves out tx bodies, and getblockheader has no flags.
+    # The last PoW block found is kept in ~/.<coin>/lastpow, so the
+    # next run only needs to look at the blocks since then.
+    powfile = coindir(coin) + "/lastpow"
 
-    return rewards[-1]
+    try:
+        (powheight, powhash, powmint) = ReadLines(powfile)[0].split()
+        powheight = int(powheight)
+        powmint = float(powmint)
+    except:
+        powheight = -1
 
-def groestl_reward(blocks):
-    if blocks >= 150000:
-        return max(exp_decay(25, blocks-150000, 10080, 0.99), 5)
+    bottom = max(blocks - 1000, powheight)
 
-    if blocks >= 120000:
-        return exp_decay(250, blocks-120000, 1440, 0.9)
+    for top in range(blocks, bottom, -window):
+        heights = range(top, max(top - window, bottom), -1)
+        headers = chain_headers(s, coin, blocks, heights, True)
 
-    # Default to old scheme
-    return exp_decay(512, blocks, 10080, 0.94)
+        for i in heights:
+            if i in headers and headers[i][3] == "proof-of-work":
+                try:
+                    File = open(powfile, "w")
+                    File.write("%i %s %r\n" % (i, headers[i][0], headers[i][4]))
+                    File.close()
+                except:
+                    pass
 
-def firo_reward(blocks):
-    # 2022-09-26 Following the hard fork at block 486221. I'm not sure
-    # how the halving period applies after that, but this is a start,
-    # based on firo/src/chainparams.cpp.
-    if blocks < 302438:
-        return 25
-    elif blocks < 486221:
-        return 12.5
-    else:
-        return exp_decay(6.25, blocks - 486221, 840000)
+                return headers[i][4]
+
+    # Nothing newer, so check that the remembered block is still on
+    # the chain
+    if powheight > blocks - 1000:
+        headers = chain_headers(s, coin, blocks, [powheight], True)
+        if powheight in headers and headers[powheight][0] == powhash:
+            return powmint
+
+        # Reorged away, so start over
+        os.unlink(powfile)
+        return lastreward(blocks, window)
 
-def lastreward(blocks):
-    # Use the last block reward as an estimate, need to check for PoW,
-    # should work for several coins. Don't wind back too much in case
-    # of PoS only.
-    for i in range(blocks, blocks - 1000, -1):
-        b = s.getblock(s.getblockhash(i))
-        if b["flags"] == "proof-of-work":
-            return b["mint"]
     return 0
 
 def blockreward(coin, diff, blocks):
-    if coin == "peercoin":
-        # https://bitcointalk.org/index.php?topic=101820.msg1118737#msg1118737
-        # "The block reward for a work block is sqrt(sqrt(9999^4 /
-        # difficulty)), rounded down to the next cent boundary."
-        return int(999900. / diff**0.25) / 100.
-    elif coin == "gapcoin":
-        return exp_decay(diff, blocks, 420000)
-    elif coin == "primecoin":
-        # block reward = 999 / diff**2, likewise floored to cent
-        return int(99900. / diff**2) / 100.
-    elif coin in ["blakecoin", "photon"]:
-        return initcoins[coin] + round((blocks * diff * 256)**0.5) * 1e-8
-    elif coin == "dash":
-        return max(2222222. / (((diff + 2600.)/9.)**2), 5.0)
-    elif coin == "groestlcoin":
-        return groestl_reward(blocks)
-    elif coin in reward_stairs.keys():
-        return staired_reward(blocks, reward_stairs[coin])
-    elif coin in blockhalve.keys() and blockhalve[coin] == 0:
-        return initcoins[coin]
-    elif coin == "virtacoin":
-        # 8000 coins per block, reduces by 0.5% each week starting 2/28/14
-        return exp_decay(8000, blocks, 10080, 0.995)
-    elif coin == "cryptonite":
+    # 2026-10-18 The daemon specific cases stay here, the rest is in
+    # bittools
+    if coin == "cryptonite":
         coinbase = ep_dec(s.listbalances(1, ["CGTta3M4t3yXu8uRgkKvaWd2d8DQvDPnpL"])[0]["balance"])
         final_total = (2**64 - 1) * 1e-10
         return 243.1 * coinbase / final_total
@@ -91,40 +79,9 @@ def blockreward(coin, diff, blocks):
         # From reward.cpp until block 325000
         #return exp_decay(128, blocks, 50000, 5./6.)
         return lastreward(blocks)
-    elif coin == "zcash":
-        # Linear ramp-up for the first 20000 blocks, then basic halving
-        return min(blocks/2e4, 1) * exp_decay(initcoins[coin], blocks, blockhalve[coin])
-    elif coin == "firo":
-        return firo_reward(blocks)
-    elif coin == "patchcoin":
-        # Proof of Stake only
-        return 0
     else:
-        return exp_decay(initcoins[coin], blocks, blockhalve[coin])
-
-def devtax_percent(coin, blocks):
-    # Depends on block height so need a proper function
-    if coin == "zcash":
-        # Until first halving only
-        if blocks <= blockhalve[coin]:
-            tax = 20
-    elif coin == "firo":
-        # Znodes -- making money centralized again
-        # Until first halving only
-        # 2022-09-26 New hard fork at block 486221
-        if blocks < 302438:
-            tax = 44
-        elif blocks < 486221:
-            tax = 50
-        else:
-            tax = 75
-    elif coin == "zen":
-        tax = 30
-    else:
-        tax = 0
-        
-    return tax
-    
+        return schedule_reward(coin, diff, blocks)
+
 # Extended precision float encoding for Cryptonite
 def ep_enc(x):
     return '%.10fep' % x
@@ -133,53 +90,14 @@ def ep_dec(s):
     return float(s.rstrip('ep'))
 
 def total_supply(coin, blocks, info):
-    total = 0
-    final_total = 0
-
-    # This should really be made more generic, like blockhalve, but
-    # this will do until more coins come up with different exp bases.
-    if coin == "virtacoin":
-        base = 0.995
-    else:
-        base = 0.5
-
-    if coin in reward_stairs.keys():
-        # Current reward algo tells us which cycle is on
-        reward = staired_reward(blocks, reward_stairs[coin])
-        cycle = reward_stairs[coin][1].index(reward)
-
-        # Total over finished cycles
-        total = sum([(reward_stairs[coin][0][j+1] - reward_stairs[coin][0][j]) * reward_stairs[coin][1][j] for j in range(cycle)])
-
-        # + total over current cycle
-        total += (blocks - reward_stairs[coin][0][cycle]) * reward
-
-    elif coin in blockhalve.keys() and blockhalve[coin] > 0:
-        reward = exp_decay(initcoins[coin], blocks, blockhalve[coin])
-        fullcycles = int(blocks / blockhalve[coin])
-        
-        # Total over finished halving cycles
-        total = (1 - base**fullcycles) / (1 - base) * blockhalve[coin] * initcoins[coin]
-
-        # + total over current cycle
-        total += (blocks - fullcycles * blockhalve[coin]) * reward
-
-        final_total = blockhalve[coin] / (1 - base) * initcoins[coin]
-
-        if coin == "zcash":
-            # Deduct the initial ramp-up effect from totals
-            ramp_blocks = min(blocks, 2e4)
-            total -= 12.5 * (2.0 - ramp_blocks/2e4)/2.0 * ramp_blocks
-            final_total -= 12.5 * 2e4 / 2
-        
-    elif coin in ["blakecoin", "photon", "namecoin"]:
-        total = blocks * initcoins[coin]
-
-    elif coin == "cryptonite":
+    if coin == "cryptonite":
         # Coinbase address
         coinbase = ep_dec(s.listbalances(1, ["CGTta3M4t3yXu8uRgkKvaWd2d8DQvDPnpL"])[0]["balance"])
         final_total = (2**64 - 1) * 1e-10
         total = final_total - coinbase
+    else:
+        # 2026-10-18 From the emission schedule in coins.py
+        (total, final_total) = coin_supply(coin, blocks)
 
     for i in ["moneysupply", "total_amount"]:
         if i in info:
@@ -196,93 +114,167 @@ def own_share(coin, blocks, info, fiatprice, basecur):
     if info["balance"] > 0:
         if total > 0:
             share = info["balance"] / total
-            printout.append([str(share * 100), str(int(round(1/share))) + " of all current " + currency[coin]])
+            printout.append([str(share * 100), str(int(round(1/share))) + " of all current " + registry[coin].ticker])
 
         if final_total > 0:
             share = info["balance"] / final_total
-            printout.append([str(share * 100), str(int(round(1/share))) + " of all " + currency[coin] + " ever"])
+            printout.append([str(share * 100), str(int(round(1/share))) + " of all " + registry[coin].ticker + " ever"])
 
     if len(printout) > 0:
         print("\nYour balance represents about")
 
         prettyprint(printout, " % or 1/")
 
-def parse_config(conffile):
-    # config file parsing shamelessly adapted from jgarzik's pyminer, as
-    # Python's configparser insists on having sections
+def walletdump(dumpfile, fifo = False):
+    # 2026-10-18 Lines of the wallet dump, read as they come. The fifo
+    # variant has the daemon write into a named pipe in a private
+    # temp dir, so the keys never touch the disk. That needs a daemon
+    # on the same host, allowed to write over an existing file. If it
+    # fails, stop there instead of dumping into a file after all.
+    if fifo:
+        from errno import ENXIO
+        from tempfile import mkdtemp
+        from threading import Thread
+        from time import sleep
+
+        tmpdir = mkdtemp()
+        pipe = os.path.join(tmpdir, os.path.basename(dumpfile))
+        os.mkfifo(pipe, 0o600)
+
+        errors = []
+        done = []
+
+        def dump():
+            try:
+                # Separate connection for this thread
+                rpc_server(url, options.timeout, options.retries).dumpwallet(pipe)
+            except Exception as e:
+                errors.append(e)
+
+                # Unblock the reader, if it still waits for a writer.
+                # Without a reader, ENXIO instead of blocking.
+                while len(done) == 0:
+                    try:
+                        os.close(os.open(pipe, os.O_WRONLY | os.O_NONBLOCK))
+                        break
+                    except OSError as e:
+                        if e.errno != ENXIO:
+                            raise
+                        sleep(0.1)
+
+        t = Thread(target = dump)
+        t.daemon = True
+        t.start()
+
+        try:
+            File = open(pipe, "r")
+            for line in File:
+                yield line
+            File.close()
+        finally:
+            done.append(True)
 
-    # teknohog changed this from search to match, as the simpler
-    # version is enough here.
+        t.join()
+        os.unlink(pipe)
+        os.rmdir(tmpdir)
 
-    settings = {}
-    config = ReadLines(os.path.expanduser(conffile))
-    for line in config:
-        # skip comment lines
-        m = re.match(r'\s*#', line)
-        if m:
+        if len(errors) > 0:
+            print("Dumping into a pipe failed: " + str(errors[0]))
+            exit(1)
+
+        return
+
+    s.dumpwallet(dumpfile)
+
+    # The open file stays readable, so remove the keys from disk
+    # right away
+    File = open(dumpfile, "r")
+    os.unlink(dumpfile)
+
+    for line in File:
+        yield line
+
+    File.close()
+
+def dumpwallet_keys(lines):
+    # Compiled once for the whole dump
+    import re
+    dump_addr = re.compile(r'.*addr=(\S.*)$')
+    dump_label = re.compile(r'.*label=(\S.*)\s+#.*')
+
+    for line in lines:
+        # Check for valid lines first, as they have addr=... in the end
+        if "addr=" not in line or dump_addr.match(line) is None:
             continue
-        
-        # parse key=value lines                                         
-        m = re.match(r'(\w+)\s*=\s*(\S.*)$', line)
+
+        m = dump_label.match(line)
         if m is None:
-            continue
-        settings[m.group(1)] = m.group(2)
+            account = ""
+        else:
+            account = m.group(1)
+
+        privkey = line.split()[0]
+
+        yield [privkey, account]
+
+def vcash_keys(lines, chunk = 1000):
+    kats = []
+
+    for line in lines:
+        kat = line.split(",") # Key,Address,Type
+        if len(kat) == 3 and kat[0] != "Key":
+            kats.append(kat)
+
+        if len(kats) >= chunk:
+            for row in vcash_labels(kats):
+                yield row
+            kats = []
+
+    for row in vcash_labels(kats):
+        yield row
 
-    return settings
+def vcash_labels(kats):
+    # Could also check for "reserve" addresses which might not be
+    # essential to save
+    labelled = [kat[1] for kat in kats if kat[2].strip() == "label"]
+    accounts = dict(zip(labelled, rpc_batch(s, [("getaccount", [addr]) for addr in labelled])))
+
+    for kat in kats:
+        if kat[2].strip() == "label":
+            account = accounts[kat[1]]
+            if isinstance(account, Exception):
+                raise account
+        else:
+            account = ""
+
+        yield [kat[0], account]
 
 def exportkeys():
-            
-    from os import unlink
-        
     l = []
 
     try:
         # dumpwallet is the best method if available, as it should
         # give the complete list of keys. Vcash has a different format
         # -- maybe other coins use csv too?
-        
+
+        # 2026-10-18 Streaming from the dump to the output, without
+        # holding the whole dump in memory
         if coin == "Vcash":
             dumpfile = os.path.expanduser("~/.Vcash/data/wallet.csv")
-            s.dumpwallet(dumpfile)
-            keydump = ReadLines(dumpfile)[1:]
-            unlink(dumpfile)
-            
-            for line in keydump:
-                kat = line.split(",") # Key,Address,Type
-                if len(kat) == 3:
-                    # Could also check for "reserve" addresses which
-                    # might not be essential to save
-                    
-                    if kat[2].strip() == "label":
-                        account = s.getaccount(kat[1])
-                    else:
-                        account = ""
-
-                    l.append([kat[0], account])
-
+            rows = vcash_keys(walletdump(dumpfile, options.fifo))
         else:
             dumpfile = os.path.expanduser("~/." + coin + "/walletdump.txt")
-            s.dumpwallet(dumpfile)
-            keydump = ReadLines(dumpfile)
-            unlink(dumpfile)
-
-            for line in keydump:
-                # Check for valid lines first, as they have addr=... in the end
-                m = re.match(r'.*addr=(\S.*)$', line)
-                if m is None:
-                    continue
-
-                m = re.match(r'.*label=(\S.*)\s+#.*', line)
-                if m is None:
-                    account = ""
-                else:
-                    account = m.group(1)
+            rows = dumpwallet_keys(walletdump(dumpfile, options.fifo))
 
-                privkey = line.split()[0]
-                    
-                l.append([privkey, account])
+        # Only the first row decides whether dumpwallet works. Once
+        # keys are printed, any later error must stop the export
+        # instead of falling back and mixing in another list.
+        try:
+            first = [next(rows)]
+        except StopIteration:
+            first = []
 
-    except:
+    except Exception:
         print("No dumpwallet method available, list of keys may be incomplete")
         
         # Generate addresses are not available via accounts, even though
@@ -300,27 +292,49 @@ def exportkeys():
 
         # EXCL: "Accounting API is deprecated and will be removed in future."
         try:
-            if coin in coins_using_labels:
+            if registry[coin].labels:
                 flist = s.listlabels
-                faddr = s.getaddressesbylabel
+                faddr = "getaddressesbylabel"
             else:
                 flist = s.listaccounts
-                faddr = s.getaddressesbyaccount
+                faddr = "getaddressesbyaccount"
                 
-            accounts = flist()
-
-            for acc in accounts:
-                addresses = faddr(acc)
+            accounts = list(flist())
+
+            # 2026-10-18 All accounts and keys in batches, and a set
+            # for the dupe check
+            items = []
+            for (acc, addresses) in zip(accounts, rpc_batch(s, [(faddr, [acc]) for acc in accounts])):
+                if isinstance(addresses, Exception):
+                    raise addresses
                 for addr in addresses:
-                    privkey = s.dumpprivkey(addr)
-                    item = [privkey, acc]
-            
-                    if item not in l:
-                        l.append(item)
+                    items.append([addr, acc])
+
+            privkeys = dumpprivkeys([item[0] for item in items])
+
+            seen = set(map(tuple, l))
+            for i in range(len(items)):
+                item = [privkeys[i], items[i][1]]
+
+                if tuple(item) not in seen:
+                    seen.add(tuple(item))
+                    l.append(item)
         except:
             print("Warning: missing listaccounts/listlabels method, list of keys may be incomplete\n")
 
-    prettyprint(l)
+        prettyprint(l)
+        return
+
+    streamprint(chain(first, rows))
+
+def dumpprivkeys(addresses):
+    keys = rpc_batch(s, [("dumpprivkey", [addr]) for addr in addresses])
+
+    for k in keys:
+        if isinstance(k, Exception):
+            raise k
+
+    return keys
 
 def listaddressgroupings(privkeys = False, lowlimit = -1):
     # 2025-08-05 Generalize exportaddressgroupings() for listing plain
@@ -329,6 +343,12 @@ def listaddressgroupings(privkeys = False, lowlimit = -1):
     l = []
     g = s.listaddressgroupings()
 
+    # 2026-10-18 All the keys in batches, only for the addresses
+    # that are listed
+    if privkeys:
+        addresses = [a[0] for group in g for a in group if a[1] > lowlimit]
+        keys = dict(zip(addresses, dumpprivkeys(addresses)))
+
     total = 0
     
     for group in g:
@@ -337,8 +357,8 @@ def listaddressgroupings(privkeys = False, lowlimit = -1):
             amount = addrline[1]
 
             # 2025-08-05 Address or key
-            if privkeys:
-                ak = s.dumpprivkey(address)
+            if privkeys and amount > lowlimit:
+                ak = keys[address]
             else:
                 ak = address
                 
@@ -380,64 +400,174 @@ def listnonempty():
     # instead
     prettyprint(listaddressgroupings(False, 0))
     
-def importkeys(file):
+def import_descriptors(keys):
+    # Descriptor wallets have no importprivkey, so import each key as
+    # a combo() descriptor instead. These need a checksum from the
+    # daemon first.
+    infos = rpc_batch(s, [("getdescriptorinfo", ["combo(" + k[0] + ")"]) for k in keys])
+
+    requests = []
+    for i in range(len(keys)):
+        if isinstance(infos[i], Exception):
+            requests.append(None)
+            continue
+
+        # getdescriptorinfo returns the public version, so add the
+        # checksum to the private one
+        desc = "combo(" + keys[i][0] + ")#" + infos[i]["checksum"]
+
+        # No rescan here, it is done once at the end
+        requests.append({"desc": desc, "timestamp": "now", "label": keys[i][1]})
+
+    results = s.importdescriptors([r for r in requests if r is not None])
+
+    # Back to one result per key
+    ok = []
+    for r in requests:
+        if r is None:
+            ok.append(False)
+        else:
+            ok.append(results.pop(0)["success"])
+
+    return ok
+
+def keyline(line):
+    # Account names may contain spaces, so split only once to get
+    # the key. Note that the split point may contain multiple
+    # spaces due to prettyprint.
+    iargs = list(map(lambda s: s.strip(), line.split(None, 1)))
+
+    # account is optional
+    if len(iargs) == 1:
+        iargs.append("")
+
+    return iargs
+
+def importkeys(file, chunk = 100):
+    # 2026-10-18 Import keys in batches without rescanning, and rescan
+    # only once at the end, instead of a full rescan per key. Progress
+    # is saved in file.progress, so an interrupted import can be
+    # resumed by running the same command again. The progress is for
+    # the same size and mtime of the file only, and also counts the
+    # keys imported, as there is nothing to rescan without them.
     lines = ReadLines(file)
     nlines = len(lines)
-    
+
+    st = os.stat(file)
+    stamp = "%i %i" % (st.st_size, st.st_mtime)
+
+    progressfile = file + ".progress"
+    try:
+        (done, imported, size, mtime) = ReadLines(progressfile)[0].split()
+        if size + " " + mtime != stamp:
+            raise ValueError
+
+        done = int(done)
+        imported = int(imported)
+        print("Resuming after line %i" % done)
+    except:
+        done = 0
+        imported = 0
+
     starttime = time()
-    
-    for i in range(nlines):
-        line = lines[i]
-        
-        # Account names may contain spaces, so split only once to get
-        # the key. Note that the split point may contain multiple
-        # spaces due to prettyprint.
-        iargs = list(map(lambda s: s.strip(), line.split(None, 1)))
+    startline = done
+    descriptors = False
 
-        lineno = i + 1
+    while done < nlines:
+        keys = []
+        linenos = []
 
-        if len(iargs) > 0:
-            privkey = iargs[0]
-        else:
-            print("Empty line %i ignored" % lineno)
-            continue
+        for i in range(done, min(done + chunk, nlines)):
+            iargs = keyline(lines[i])
+            lineno = i + 1
 
-        if len(privkey) not in [51, 52]:
-            print("Key %i/%i ignored: %s" % (lineno, nlines, privkey))
-            continue
+            if len(iargs) > 0:
+                privkey = iargs[0]
+            else:
+                print("Empty line %i ignored" % lineno)
+                continue
 
-        try:
-            # account is optional, so the list is fine as-is
-            s.importprivkey(*iargs)
-        except:
-            print("Key %i/%i failed import: %s" % (lineno, nlines, privkey))
-            continue
-            
-        # Succesful imports can take a long time, so give some estimate
+            if len(privkey) not in [51, 52]:
+                print("Key %i/%i ignored: %s" % (lineno, nlines, privkey))
+                continue
+
+            keys.append(iargs)
+            linenos.append(lineno)
+
+        if not descriptors:
+            results = rpc_batch(s, [("importprivkey", [k[0], k[1], False]) for k in keys])
+            ok = [not isinstance(r, Exception) for r in results]
+
+            # Descriptor wallets refuse importprivkey: "Only legacy
+            # wallets are supported by this command"
+            if len(keys) > 0 and not any(ok) and "legacy" in str(results[0]):
+                descriptors = True
+
+        if descriptors:
+            ok = import_descriptors(keys)
+
+        for i in range(len(keys)):
+            if not ok[i]:
+                print("Key %i/%i failed import: %s" % (linenos[i], nlines, keys[i][0]))
+
+        done = min(done + chunk, nlines)
+        imported += sum(ok)
+
+        File = open(progressfile, "w")
+        File.write("%i %i %s\n" % (done, imported, stamp))
+        File.close()
+
+        # Imports can still take a long time, so give some estimate
         passed = time() - starttime
-        est_total = passed / lineno * nlines
+        est_total = passed / (done - startline) * (nlines - startline)
         eta = ctime(starttime + est_total)
         tp = timeprint(passed)
-        
-        print("Key %i/%i imported, %.2f %s passed, ETA %s" % (lineno, nlines, tp[0], tp[1], eta))
+
+        print("Keys up to %i/%i imported, %.2f %s passed, ETA %s" % (done, nlines, tp[0], tp[1], eta))
+
+    if imported == 0:
+        print("No keys imported, no need to rescan")
+    else:
+        print("Rescanning the blockchain, this may take a while")
+
+        # On a connection of its own without a timeout, as the rescan
+        # takes much longer than any normal call
+        rescan = rpc_server(url, 0, options.retries)
+
+        try:
+            rescan.rescanblockchain()
+        except Exception as e:
+            if not method_missing(e):
+                raise
+
+            # Older daemons have no separate rescan, so import the last
+            # key again with rescan
+            for line in lines[::-1]:
+                iargs = keyline(line)
+                if len(iargs) > 0 and len(iargs[0]) in [51, 52]:
+                    rescan.importprivkey(iargs[0], iargs[1], True)
+                    break
+
+    # Not written if there were no lines to import
+    if os.path.exists(progressfile):
+        os.unlink(progressfile)
 
 def listaccounts():
-    if coin in coins_using_labels:
+    if registry[coin].labels:
         labels = s.listlabels()
 
         ag = s.listaddressgroupings()
 
         if len(labels) > 0:
-            ltotals = {}
+            # 2026-10-18 Single walk over the groupings, instead of
+            # one for each label
+            ltotals = dict.fromkeys(labels, 0)
 
-            for l in labels:
-                ltotals[l] = 0
-                
-                # This looks more nested than expected
-                for ga in ag:
-                    for gb in ga:
-                        if len(gb) > 2 and gb[2] == l:
-                            ltotals[l] += gb[1]
+            # This looks more nested than expected
+            for ga in ag:
+                for gb in ga:
+                    if len(gb) > 2 and gb[2] in ltotals:
+                        ltotals[gb[2]] += gb[1]
 
             acc = ltotals
         else:
@@ -447,14 +577,10 @@ def listaccounts():
         acc = s.listaccounts()
 
     if len(acc) > 0:
-        output = []
-        for item in acc:
-            output.append([item, str(acc[item])])
-    
-        prettyprint(output)
+        streamprint([item, str(acc[item])] for item in acc)
 
 def listreceived():
-    if coin in coins_using_labels:
+    if registry[coin].labels:
         key = "label"
         rec = s.listreceivedbylabel()
     else:
@@ -468,8 +594,121 @@ def listreceived():
     
         prettyprint(output)
 
+def transaction_row(item):
+    unconfirmed = item["confirmations"] < 1 or item["category"] == "immature"
+    if "address" in item.keys():
+        address = item["address"]
+    else:
+        address = ""
+
+    label = ""
+    for i in ["account", "label"]:
+        if i in item.keys():
+            label = item[i]
+            break
+
+    out_line = [ctime(item["time"]), item["category"][0].upper(), label, str(item["amount"]), unconfirmed * "*"]
+
+    if options.verbose:
+        if item["category"] == "send":
+            feestr = str(abs(item["fee"]))
+        else:
+            # Filler for the output matrix
+            feestr = ""
+
+        out_line += [address, str(item["confirmations"]), feestr]
+
+    return out_line
+
+def datestamp(date):
+    # Local YYYY-MM-DD to unix time
+    from time import mktime, strptime
+    return mktime(strptime(date, "%Y-%m-%d"))
+
+def transaction_filter():
+    # 2026-10-18 Optional filters for -t, checked on the raw items
+    # before any output rows are made
+    if options.category:
+        categories = options.category.split(",")
+    else:
+        categories = None
+
+    if options.since:
+        since = datestamp(options.since)
+    else:
+        since = None
+
+    if options.until:
+        # Inclusive, up to the end of that day
+        until = datestamp(options.until) + 86400
+    else:
+        until = None
+
+    def wanted(item):
+        if categories is not None and item["category"] not in categories:
+            return False
+        if options.minamount > 0:
+            amount = item["amount"]
+            if coin == "cryptonite":
+                amount = ep_dec(amount)
+            if abs(amount) < options.minamount:
+                return False
+        if since is not None and item["time"] < since:
+            return False
+        if until is not None and item["time"] >= until:
+            return False
+        return True
+
+    return (wanted, since)
+
+def paged_transactions(account, count, page, since = None):
+    # 2026-10-18 Walk the window in pages with count/skip, newest
+    # first. With a start date, stop at the first page that is
+    # entirely older than that.
+    skip = 0
+    while skip < count:
+        n = min(page, count - skip)
+        trans = s.listtransactions(account, n, skip)
+
+        for item in trans[::-1]:
+            yield item
+
+        if len(trans) < n:
+            break
+
+        if since is not None and max([item["time"] for item in trans]) < since:
+            break
+
+        skip += n
+
 def listtransactions(args):
 
+    (wanted, since) = transaction_filter()
+
+    if options.verbose:
+        header = [["Date", "T", "Label", "Amount", "", "Address", "Confs", "Fee"]]
+    else:
+        header = []
+
+    if options.page > 0:
+        # 2026-10-18 Paged mode for large windows, printing rows as
+        # they arrive
+        if len(args) > 0:
+            account = args[0]
+        else:
+            account = "*"
+
+        if len(args) == 2:
+            count = int(args[1])
+        else:
+            count = 10
+
+        trans = paged_transactions(account, count, options.page, since)
+        rows = (transaction_row(item) for item in trans if wanted(item))
+
+        streamprint(chain(header, rows))
+        return
+
     # Optional selection by account and number of transactions there.
     if len(args) == 1:
         trans = s.listtransactions(args[0])
@@ -477,42 +716,107 @@ def listtransactions(args):
         trans = s.listtransactions(args[0], int(args[1]))
     else:
         trans = s.listtransactions()
+
+    trans = [item for item in trans if wanted(item)]
+
+    if options.newest:
+        trans.reverse()
         
     if len(trans) > 0:
+        output = header
 
-        if options.verbose:
-            output = [["Date", "T", "Label", "Amount", "", "Address", "Confs", "Fee"]]
-        else:
-            output = []
-            
         for item in trans:
-            unconfirmed = item["confirmations"] < 1 or item["category"] == "immature"
-            if "address" in item.keys():
-                address = item["address"]
-            else:
-                address = ""
+            output.append(transaction_row(item))
 
-            label = ""
-            for i in ["account", "label"]:
-                if i in item.keys():
-                    label = item[i]
-                    break
+        prettyprint(output)
+        
+def all_transactions(count = 1000):
+    # Whole wallet history, newest pages first
+    skip = 0
+    while True:
+        page = s.listtransactions("*", count, skip)
+        for item in page:
+            yield item
+
+        if len(page) < count:
+            break
 
-            out_line = [ctime(item["time"]), item["category"][0].upper(), label, str(item["amount"]), unconfirmed * "*"]
+        skip += count
 
-            if options.verbose:
-                if item["category"] == "send":
-                    feestr = str(abs(item["fee"]))
-                else:
-                    # Filler for the output matrix
-                    feestr = ""
+def sent_index():
+    # 2026-10-18 Local index of sent-to addresses, {address: [[amount,
+    # time, txid], ...]}, kept in ~/.coin/sent. Built once from the
+    # whole history, then updated with listsinceblock from the last
+    # seen block. Txids are checked for dupes, as the same unconfirmed
+    # sends come up again on the next update.
+    sentfile = coindir(coin) + "/sent"
 
-                out_line += [address, str(item["confirmations"]), feestr]
+    index = {}
+    lastblock = None
 
-            output.append(out_line)
+    try:
+        lines = ReadLines(sentfile)
+        lastblock = lines[0].split()[1]
+        for line in lines[1:]:
+            f = line.split()
+            index.setdefault(f[0], []).append([float(f[1]), int(f[2]), f[3]])
+    except:
+        index = {}
+        lastblock = None
+
+    oldblock = lastblock
+
+    if lastblock is not None:
+        try:
+            since = s.listsinceblock(lastblock)
+            trans = since["transactions"]
+            lastblock = since["lastblock"]
+        except:
+            # Unknown block or no such method, start over
+            index = {}
+            lastblock = None
+
+    if lastblock is None:
+        # Blocks coming in during the walk are seen again on the next
+        # update, which is fine with the dupe check
+        lastblock = s.getblockhash(s.getblockcount())
+        trans = all_transactions()
+
+    changed = lastblock != oldblock
+
+    for item in trans:
+        if item.get("category") != "send" or "address" not in item:
+            continue
+
+        sends = index.setdefault(item["address"], [])
+        txid = item.get("txid", "-")
+
+        if txid not in [x[2] for x in sends]:
+            if coin == "cryptonite":
+                amount = ep_dec(item["amount"])
+            else:
+                amount = float(item["amount"])
+
+            sends.append([amount, int(item["time"]), txid])
+            changed = True
+
+    if changed:
+        tmpfile = sentfile + ".tmp" + str(os.getpid())
+
+        try:
+            File = open(tmpfile, "w")
+            File.write("lastblock " + lastblock + "\n")
+            for address in index:
+                for x in index[address]:
+                    File.write("%s %r %i %s\n" % (address, x[0], x[1], x[2]))
+            File.close()
+            os.rename(tmpfile, sentfile)
+        except:
+            # The index is rebuilt next time
+            pass
+
+    return index
 
-        prettyprint(output)
-        
 def send(address, amount, new_txfee):
     # Double check the amount and address -- the command line may be
     # split over two lines, making the amount less obvious
@@ -525,17 +829,21 @@ def send(address, amount, new_txfee):
     else:
         txfee = default_txfee
         
-    print("About to send " + currency[coin] + " " + str(amount) + " to " + address + " with txfee " + str(txfee))
+    print("About to send " + registry[coin].ticker + " " + str(amount) + " to " + address + " with txfee " + str(txfee))
 
     # Warn of potential dupes; sends show up with empty account name
-    trans = s.listtransactions()
-    if len(trans) > 0:
-        for item in trans:
-            if "address" in item.keys() and address == item["address"]:
-                if coin == "cryptonite":
-                    item["amount"] = ep_dec(item["amount"])
+    try:
+        # 2026-10-18 Whole history via the local index
+        trans = [{"amount": x[0], "time": x[1]} for x in sent_index().get(address, [])]
+    except:
+        trans = [item for item in s.listtransactions() if "address" in item.keys() and address == item["address"]]
+
+        if coin == "cryptonite":
+            for item in trans:
+                item["amount"] = ep_dec(item["amount"])
 
-                print("Warning! " + str(abs(item["amount"])) + " already sent to this address on " + ctime(item["time"]))
+    for item in trans:
+        print("Warning! " + str(abs(item["amount"])) + " already sent to this address on " + ctime(item["time"]))
                 
     if confirm():
         if coin == "cryptonite":
@@ -561,22 +869,30 @@ def send(address, amount, new_txfee):
     if new_txfee >= 0:
         s.settxfee(default_txfee)
         
-def meandiff2(coin):
+def meandiff2(coin, ndata = 10, spacing = 0):
     # Alternative for testing: use blockchain data instead of saved
     # logfiles. A nice idea but notably slower :-/
-    ndata = 10
-    blockint = blocksperhour[coin]
-    data = []
+
+    # 2026-10-18 Now via the local header store, so only new blocks
+    # are fetched, with their hashes in one batch and headers in
+    # another, and no tx lists. Default spacing is one hour. Samples
+    # below the tip fall on multiples of the spacing, so that later
+    # runs find them in the store.
+    if spacing <= 0:
+        spacing = registry[coin].blocksperhour
 
     # Start from top block and work backwards
-    i = info["blocks"]
-    for n in range(ndata):
-        # PoW only coins for now, see lastreward() for PoW/PoS flags
-        b = s.getblock(s.getblockhash(i))
-        data.append([b["time"], b["difficulty"]])
-        i -= blockint
-
-    if len(data) >= ndata/2:
+    # PoW only coins for now, see lastreward() for PoW/PoS flags
+    tip = info["blocks"]
+    heights = [tip] + [tip - tip % spacing - n * spacing for n in range(1, ndata)]
+
+    headers = chain_headers(s, coin, tip, heights)
+
+    data = []
+    for h in headers.values():
+        data.append([h[1], h[2]])
+
+    if len(data) >= max(ndata/2, 2):
         ab = linear_regression(data)
 
         # Estimate a current diff
@@ -584,41 +900,142 @@ def meandiff2(coin):
     else:
         return 0
 
-def getinfo():
+def sweep(axes, blocks, csv = False):
+    # 2026-10-18 Profitability over a grid of difficulties, coin
+    # prices, hashrates, watts and kWh prices, all at once. axes holds
+    # the values of each; the chain info and prices are already in.
+    import numpy
+
+    names = ["diff", "price", "hashrate", "watts", "kwhprice"]
+    shape = [len(axes[n]) for n in names]
+
+    if registry[coin].schedule is None:
+        # From the daemon, the same for all difficulties
+        rewards = [blockreward(coin, axes["diff"][0], blocks)] * shape[0]
+    else:
+        rewards = [blockreward(coin, d, blocks) for d in axes["diff"]]
+
+    devtax = devtax_percent(coin, blocks)
+    rewards = [r - r * devtax / 100.0 for r in rewards]
+
+    hashrates = numpy.asarray(axes["hashrate"], dtype = float)
+    blocktimes = [mining_blocktime(coin, d, hashrates) for d in axes["diff"]]
+
+    grid = profit_grid(blocktimes, rewards, axes["price"], axes["watts"], axes["kwhprice"])
+
+    if csv:
+        import sys
+
+        mesh = numpy.meshgrid(*[axes[n] for n in names], indexing = "ij")
+        columns = [m.ravel() for m in mesh]
+        for key in ["coinsperday", "fiatpay", "cost", "net", "breakeven"]:
+            columns.append(numpy.broadcast_to(grid[key], shape).ravel())
+
+        numpy.savetxt(sys.stdout, numpy.column_stack(columns), fmt = "%.10g", delimiter = ",", comments = "", header = ",".join(names + ["coinsperday", "fiatpay", "cost", "net", "breakeven_kwhprice"]))
+        return
+
+    # One line for each combination of the other parameters, with the
+    # break-even kWh price and the net profit at each kWh price, so
+    # the break-even contour shows up where the sign changes. Only the
+    # parameters that vary get a column.
+    shown = [i for i in range(4) if shape[i] > 1 or names[i] == "hashrate"]
+
+    header = [names[i] for i in shown] + [registry[coin].ticker + "/day", options.basecur + "/day", "break-even kWh"]
+    header += ["net @ %g" % k for k in axes["kwhprice"]]
+
+    def rows():
+        yield header
+
+        for index in numpy.ndindex(*shape[:4]):
+            (d, p, h, w) = index
+            line = ["%g" % axes[names[i]][index[i]] for i in shown]
+
+            line.append("%g" % grid["coinsperday"][d, 0, h, 0, 0])
+            line.append("%g" % grid["fiatpay"][d, p, h, 0, 0])
+
+            breakeven = grid["breakeven"][d, p, h, w, 0]
+            if numpy.isfinite(breakeven):
+                line.append("%g" % breakeven)
+            else:
+                line.append("-")
+
+            line += ["%g" % x for x in grid["net"][d, p, h, w, :]]
+
+            yield line
+
+    streamprint(rows())
+
+def prefetched(method):
+    # 2026-10-18 Result of a call that went along with the getinfo()
+    # batch, or a fresh call if it did not
+    if method in prefetch:
+        result = prefetch[method]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return getattr(s, method)()
+
+def getinfo(extra = []):
     # Bitcoin: "deprecation-warning WARNING: getinfo is deprecated and
     # will be fully removed in 0.16. Projects should transition to
     # using getblockchaininfo, getnetworkinfo, and getwalletinfo
     # before upgrading to 0.16"
 
-    try:
-        return s.getinfo()
-    except:
-        info = s.getblockchaininfo()
-        info.update(s.getnetworkinfo())
-        info.update(s.getwalletinfo())
-        
-        # Roughly match old getinfo
-        if coin in ["patchcoin", "peercoin"]:
-            # 2019-08-28 For Peercoin total_amount (old moneysupply),
-            # should also work on others... heavy and slow on Bitcoin
-            # so limit to Peercoin for now
+    # 2026-10-18 Ask for both the old and new style info in one batch,
+    # along with any extra calls the caller needs later, so the whole
+    # startup costs a single round trip. Extra results are available
+    # via prefetched(). A daemon without batches only gets getinfo
+    # first, as before.
+    calls = [("getinfo", []), ("getblockchaininfo", []), ("getnetworkinfo", []), ("getwalletinfo", [])]
+
+    # 2025-10-14
+    if coin == "groestlcoin":
+        calls.append(("getbalance", []))
+
+    ncalls = len(calls)
+    calls += [(method, []) for method in extra]
+
+    results = rpc_batch(s, calls, serial = 1)
+
+    for i in range(len(extra)):
+        if results[ncalls + i] is not None:
+            prefetch[extra[i]] = results[ncalls + i]
+
+    if not isinstance(results[0], Exception):
+        return results[0]
+
+    info = {}
+    for i in range(1, ncalls):
+        if results[i] is None:
+            results[i] = getattr(s, calls[i][0])()
+        if isinstance(results[i], Exception):
+            raise results[i]
+        if isinstance(results[i], dict):
+            info.update(results[i])
+
+    # Roughly match old getinfo
+    if coin in ["patchcoin", "peercoin"]:
+        # 2019-08-28 For Peercoin total_amount (old moneysupply),
+        # should also work on others... heavy and slow on Bitcoin
+        # so limit to Peercoin for now
+        if "total_amount" not in info:
             info.update(s.gettxoutsetinfo())
-        
-            keys = ["balance", "blocks", "connections", "difficulty", "total_amount"]
+
+        keys = ["balance", "blocks", "connections", "difficulty", "total_amount"]
+    else:
+        keys = ["balance", "blocks", "connections", "difficulty", "paytxfee"]
+
+    output = {}
+    for key in keys:
+        if coin == "groestlcoin" and key == "balance":
+            output["balance"] = results[ncalls - 1]
         else:
-            keys = ["balance", "blocks", "connections", "difficulty", "paytxfee"]
-    
-        output = {}
-        for key in keys:
-            # 2025-10-14
-            if coin == "groestlcoin" and key == "balance":
-                output["balance"] = s.getbalance()
-            else:
-                output[key] = info[key]
+            output[key] = info[key]
 
-        output["testnet"] = (info["chain"] != "main")
-        
-        return output
+    output["testnet"] = (info["chain"] != "main")
+
+    return output
 
 def listdesc(args):
     try:
@@ -652,6 +1069,10 @@ parser.add_option("--bitcoincash", action="store_const", const="bitcoincash", de
 
 parser.add_option("--bitcoin-sv", action="store_const", const="bitcoin-sv", dest="coin", default="bitcoin", help="Connect to Bitcoin SV daemon")
 
+parser.add_option("--category", help="With -t, show only these comma-separated categories, e.g. send,receive")
+
+parser.add_option("--chaindiff", action="store_true", default=False, help="Estimate meandiff from recent block headers instead of the meandiff.sh log, see also --samples and --spacing")
+
 parser.add_option("-c", "--chncoin", action="store_const", const="chncoin", dest="coin", default="bitcoin", help="Connect to chncoind")
 
 parser.add_option("-d", "--difficulty", dest="diff", type = float, default = 0, help="Set difficulty for mining calculator")
@@ -662,6 +1083,8 @@ parser.add_option("--ecoin", action="store_const", const="ecoin", dest="coin", d
 
 parser.add_option("-E", "--electron", action="store_const", const="electron", dest="coin", default="bitcoin", help="Connect to electrond")
 
+parser.add_option("--emission", action="store_true", help = "Show the supply curve and the time to each halving or reward step (requires NumPy)")
+
 parser.add_option("--encrypt", action="store_true", help = "Encrypt wallet")
 parser.add_option("--unlock", action="store_true", help = "Unlock encrypted wallet, with optional time in seconds, default 60")
 
@@ -671,10 +1094,14 @@ parser.add_option("--exportnonempty", action="store_true", help = "Dump private
 
 parser.add_option("-F", "--gapcoin", action="store_const", const="gapcoin", dest="coin", default="bitcoin", help="Connect to gapcoind")
 
+parser.add_option("--fifo", action="store_true", help = "With -e, have the daemon dump the wallet into a named pipe instead of a file on disk. Needs a local daemon that can write over an existing file.")
+
 parser.add_option("-G", "--groestlcoin", action="store_const", const="groestlcoin", dest="coin", default="bitcoin", help="Connect to groestlcoind")
 
 parser.add_option("-g", "--ShibeCoin", action="store_const", const="ShibeCoin", dest="coin", default="bitcoin", help="Connect to ShibeCoind")
 
+parser.add_option("--halflife", type = float, default = 24, help="Hours for the weights to halve in --model ewls, default 24")
+
 parser.add_option("-H", "--photon", action="store_const", const="photon", dest="coin", default="bitcoin", help="Connect to photond")
 
 parser.add_option("-I", "--riecoin", action="store_const", const="riecoin", dest="coin", default="bitcoin", help="Connect to riecoind")
@@ -697,12 +1124,20 @@ parser.add_option("-l", "--litecoin", action="store_const", const="litecoin", de
 
 parser.add_option("--listdesc", dest="listdesc", action="store_true", default=False, help="Export wallet descriptors. Add a \"true\" argument for the private keys (which may need --unlock first)")
 
+parser.add_option("--model", type = "choice", choices = ["ols", "ewls", "retarget"], default = "ols", help="Meandiff estimator: ols for linear regression (default), ewls for exponentially weighted regression, retarget to follow fixed retarget intervals")
+
 parser.add_option("-N", "--newaddress", dest="newaddress", action="store_true", default=False, help="Get new address, optionally for the given account")
 
+parser.add_option("--minamount", type = float, default = 0, help="With -t, hide transactions smaller than this")
+
 parser.add_option("-m", "--maxcoin", action="store_const", const="maxcoin", dest="coin", default="bitcoin", help="Connect to maxcoind")
 
 parser.add_option("-n", "--namecoin", action="store_const", const="namecoin", dest="coin", default="bitcoin", help="Connect to namecoind")
 
+parser.add_option("--newest", action="store_true", default=False, help="With -t, list the newest transactions first")
+
+parser.add_option("--page", type = int, default = 0, help="With -t --newest, fetch transactions in pages of this size and print them as they arrive. Useful for large counts.")
+
 parser.add_option("--peers", action="store_true", default=False, help="List connections")
 
 #parser.add_option("-P", "--primecoin", action="store_const", const="primecoin", dest="coin", default="bitcoin", help="Connect to primecoind")
@@ -714,14 +1149,30 @@ parser.add_option("-R", "--listreceived", dest="listreceived", action="store_tru
 
 parser.add_option("-r", "--hashrate", dest="hashrate", type = float, default = 0, help="Hashes/sec from external miners, or blocksperday for primecoin")
 
+parser.add_option("--retries", type = int, default = 2, help="Retries when the daemon refuses connections, default 2")
+
 parser.add_option("-S", "--skeincoin", action="store_const", const="skeincoin", dest="coin", default="bitcoin", help="Connect to skeincoind")
 
+parser.add_option("--samples", type = int, default = 10, help="Number of blocks sampled for --chaindiff, at least 2, default 10")
+
+parser.add_option("--sweep", action = "append", default = [], help="Profitability over a range of a parameter, as name=start:stop:n or name=a,b,c, where name is one of hashrate, watts, kwhprice, diff, price; can be repeated. Requires NumPy.")
+
+parser.add_option("--csv", action = "store_true", default = False, help="With --sweep, write all results as CSV")
+
+parser.add_option("--since", help="With -t, show transactions from this date on, as YYYY-MM-DD")
+
+parser.add_option("--spacing", type = int, default = 0, help="Blocks between --chaindiff samples, default one hour's worth")
+
 parser.add_option("-s", "--sendto", dest="sendto", help="Send coins to this address, followed by the amount")
 
 parser.add_option("-T", "--TjcoinV2", action="store_const", const="TjcoinV2", dest="coin", default="bitcoin", help="Connect to Tjcoind")
 
 parser.add_option("-t", "--transactions", dest="transactions", action="store_true", default=False, help="List recent transactions, optionally filtered by account name (e.g. '' for generates), and optional number (default 10)")
 
+parser.add_option("--timeout", type = float, default = 0, help="Timeout in seconds for daemon calls, default none")
+
+parser.add_option("--until", help="With -t, show transactions up to this date, as YYYY-MM-DD")
+
 parser.add_option("--txfee", dest="txfee", type = float, default = -1, help = "Set transaction fee. When used with --sendto, applies to that send only.")
 
 parser.add_option("-U", "--universalmolecule", action="store_const", const="universalmolecule", dest="coin", default="bitcoin", help="Connect to universalmoleculed")
@@ -732,6 +1183,8 @@ parser.add_option("-V", "--virtacoin", action="store_const", const="virtacoin",
 
 parser.add_option("-v", "--verbose", dest="verbose", action="store_true", default=False, help="Print more detailed info")
 
+parser.add_option("--window", type = float, default = 0, help="Use only the last hours of the meandiff.sh log, default all")
+
 parser.add_option("-W", "--watts", dest="watts", type = float, default = 0, help="Power usage of miners for profitability calculation")
 
 parser.add_option("-w", "--kwh-price", dest="kwhprice", type = float, default = 0, help="kWh price for profitability calculation")
@@ -756,241 +1209,31 @@ parser.add_option("--zclassic", action="store_const", const="zclassic", dest="co
 
 coin = options.coin
 
-# coin-dependent constants
-
-# 0 means no block reward halving
-blockhalve = {
-    "AuroraCoin": 420000,
-    "bitcoin": 210000,
-    "bitcoincash": 210000,
-    "bitcoin-sv": 210000,
-    "btcprivate": 210000,
-    "blakebitcoin": 210000,
-    "chncoin": 2628000,
-    "dash": 0,
-    "ecoin": 0,
-    "litecoin": 840000,
-    "lithium": 0,
-    "maxcoin": 1051200,
-    "namecoin": 0,
-    "primio": 100000,
-    "riecoin": 840000,
-    "ShibeCoin": 0,
-    "skeincoin": 262800,
-    "Slothcoin": 100000,
-    "TjcoinV2": 840000,
-    "universalmolecule": 0,
-    "vertcoin": 840000,
-    "virtacoin": 10080,
-    "zcash": 840000,
-    "zclassic": 840000,
-    "firo": 302438,
-    "zen": 840000,
-}
-
-blocksperhour = {
-    "AuroraCoin": 6,
-    "bitcoin": 6,
-    "bitcoincash": 6,
-    "bitcoin-sv": 6,
-    "btcprivate": 24,
-    "blakebitcoin": 24,
-    "blakecoin": 20,
-    "chncoin": 60,
-    "cryptonite": 60,
-    "dash": 24,
-    "dirac": 20,
-    "dogecoin": 60,
-    "ecoin": 60,
-    "electron": 60,
-    "ExclusiveCoin": 90,
-    "groestlcoin": 60,
-    "gapcoin": 24,
-    "litecoin": 24,
-    "lithium": 20,
-    "maxcoin": 120,
-    "namecoin": 6,
-    "photon": 20,
-    "primecoin": 60,
-    "primio": 12,
-    "riecoin": 24,
-    "ShibeCoin": 60,
-    "skeincoin": 30,
-    "Slothcoin": 24,
-    "TjcoinV2": 24,
-    "universalmolecule": 30,
-    "Vcash": 25, # Mean?
-    "vertcoin": 24,
-    "virtacoin": 60,
-    "zcash": 24,
-    "zclassic": 48, # was: 24
-    "firo": 24,
-    "zen": 24,
-}
-
-# 0 means dynamic difficulty adjustment without fixed intervals
-adjustblocks = {
-    "AuroraCoin": 8,
-    "bitcoin": 2016,
-    "bitcoincash": 2016,
-    "bitcoin-sv": 2016,
-    "btcprivate": 0,
-    "blakebitcoin": 8064,
-    "blakecoin": 20,
-    "chncoin": 0,
-    "cryptonite": 0,
-    "dash": 0,
-    "dirac": 20,
-    "dogecoin": 0,
-    "ecoin": 100,
-    "electron": 0, # ?
-    "ExclusiveCoin": 0,
-    "gapcoin": 0,
-    "groestlcoin": 0,
-    "litecoin": 2016,
-    "lithium": 20,
-    "maxcoin": 0,
-    "namecoin": 2016,
-    "photon": 20,
-    "patchcoin": 0,
-    "peercoin": 0,
-    "primecoin": 0,
-    "primio": 12,
-    "riecoin": 288,
-    "ShibeCoin": 0,
-    "skeincoin": 0,
-    "Slothcoin": 2,
-    "TjcoinV2": 336,
-    "universalmolecule": 20,
-    "Vcash": 0, # ?4
-    "vertcoin": 0,
-    "virtacoin": 0,
-    "zcash": 0,
-    "zclassic": 0,
-    "firo": 6, # guessed from block explorer
-    "zen": 0,
-}
-
-# For coins with regular block halving
-initcoins = {
-    "AuroraCoin": 25,
-    "bitcoin": 50,
-    "bitcoincash": 50,
-    "bitcoin-sv": 50,
-    "btcprivate": 3.125, # fork starting at 1.5625 given the halving logic
-    "blakecoin": 25,
-    "blakebitcoin": 50,
-    "chncoin": 88,
-    "ecoin": 700,
-    "maxcoin": 48,
-    "namecoin": 50,
-    "litecoin": 50,
-    "photon": 32768,
-    "primio": 50,
-    "riecoin": 50,
-    "ShibeCoin": 0, # Not meaningful for mostly proof of stake coin
-    "skeincoin": 32,
-    "Slothcoin": 500000,
-    "TjcoinV2": 50,
-    "universalmolecule": 0.1, # Minimum
-    "vertcoin": 50,
-    "virtacoin": 8000,
-    "zcash": 12.5, # after first 2e5 blocks -- use for total_supply approx
-    #"zclassic": 12.5, # after first 10 blocks, so practically constant
-    "zclassic": 0.78125,
-    "firo": 25,
-    "zen": 12.5,
-}
-
-# (list of block limits, list of fixed rewards for those intervals)
-reward_stairs = {
-    "dirac": ([0, 43201, 744001, 1448001, 2145601, 2846401],
-              [8.0, 1.25, 0.75, 0.5, 0.25, 0.01]),
-    "dogecoin": ([0, 100000, 200000, 300000, 400000, 500000, 600000], 
-                 [500000, 250000, 125000, 62500, 31250, 15625, 10000]),
-    "electron": ([0, 525600, 1051200],
-                 [20, 10, 5]),
-    "ExclusiveCoin": ([0, 1120706], [8, 4]),
-    "lithium": ([0, 2000, 175000, 350000, 525000, 650000, 800000, 975000],
-                [0.48, 48, 24, 12, 6, 3, 1.5, 1]),
-}
-
-rpcport = {
-    "AuroraCoin": "12341",
-    "bitcoin": "8332",
-    "bitcoincash": "8332",
-    "bitcoin-sv": "8332",
-    "btcprivate": "7932",
-    "blakebitcoin": "243",
-    "blakecoin": "8772",
-    "chncoin": "8108",
-    "cryptonite": "8252",
-    "dash": "9998",
-    "dirac": "74532",
-    "dogecoin": "22555",
-    "ecoin": "10444",
-    "electron": "6852", 
-    "ExclusiveCoin": "22621",
-    "groestlcoin": "1441",
-    "gapcoin": "31397",
-    "litecoin": "9332",
-    "lithium": "12000",
-    "maxcoin": "8669",
-    "namecoin": "8332",
-    "photon": "8984",
-    "patchcoin": "7802",
-    "peercoin": "9902",
-    "primecoin": "9912",
-    "primio": "1218",
-    "riecoin": "28332",
-    "ShibeCoin": "18812",
-    "skeincoin": "21230",
-    "Slothcoin": "5108",
-    "TjcoinV2": "9178",
-    "universalmolecule": "19738",
-    "Vcash": "9195",
-    "vertcoin": "5888",
-    "virtacoin": "22815",
-    "zcash": "8232",
-    "zclassic": "8023",
-    "firo": "8888", # found by netstat, not what help says
-    "zen": "8231",
-}
-
-# "account" changed to "label" in these coins, need different function
-# and key names
-coins_using_labels = ["bitcoin", "bitcoincash", "groestlcoin", "litecoin", "patchcoin", "peercoin"]
+if options.page > 0 and not options.newest:
+    parser.error("--page fetches the newest transactions first, so it needs --newest")
+
+if options.chaindiff and options.samples < 2:
+    parser.error("--samples needs at least 2 blocks for a trend")
+
+if options.chaindiff and options.spacing <= 0 and registry[coin].blocksperhour <= 0:
+    parser.error("No known block rate for " + coin + ", give --spacing for --chaindiff")
 
 if len(options.url) > 0:
     url = options.url
-elif coin == "Vcash":
-    # No login credentials needed
-    url = "http://localhost:9195/"
 else:
-    if coin in ["bitcoincash", "bitcoin-sv"]:
-        # 2020-10-14 Files are named as in Bitcoin. The coin option is
-        # mainly useful for setting the currency ticker for price
-        # info.
-        configfile = "~/.bitcoin/bitcoin.conf"
-    else:
-        configfile = "~/." + coin + "/" + coin + ".conf"
-
-    settings = parse_config(configfile)
+    url = coin_url(coin)
 
-    # Use default port numbers
-    if not 'rpcport' in settings.keys():
-        settings['rpcport'] = rpcport[coin]
+s = rpc_server(url, options.timeout, options.retries)
 
-    url = "http://" + settings['rpcuser'] + ":" + settings['rpcpassword'] + "@127.0.0.1:" + settings['rpcport'] + "/"
-
-s = Server(url)
+# Results from the getinfo() batch
+prefetch = {}
 
 if options.byaccount:
     if coin == "Vcash":
         # Only one address; at least dumpwallet will give them all
         print(s.getaccountaddress(options.byaccount))
     else:
-        if coin in coins_using_labels:
+        if registry[coin].labels:
             alist = s.getaddressesbylabel(options.byaccount)
         else:
             alist = s.getaddressesbyaccount(options.byaccount)
@@ -1043,7 +1286,7 @@ if options.sendto:
 elif options.txfee >= 0:
     # 2017-01-31 Set the default. If used with sendto, there is a
     # separate temporary setting for that send only.
-    print("Setting default transaction fee to %f %s" % (options.txfee, currency[coin]))
+    print("Setting default transaction fee to %f %s" % (options.txfee, registry[coin].ticker))
     s.settxfee(options.txfee)
     exit()
     
@@ -1089,7 +1332,23 @@ if options.peers:
         print(ip)
     exit()
     
-info = getinfo()
+if options.emission:
+    output = emission_report(coin, s.getblockcount())
+
+    if len(output) > 0:
+        prettyprint(output)
+    else:
+        print("No known emission schedule for " + coin)
+    exit()
+
+# 2026-10-18 Calls needed further below, batched along with getinfo()
+extra = ["getmininginfo"]
+if coin == "peercoin" and not options.diff:
+    extra.append("getdifficulty")
+if coin == "gapcoin" and not options.hashrate:
+    extra.append("getprimespersec")
+
+info = getinfo(extra)
 
 if options.verbose:
     keys = list(info.keys())
@@ -1109,7 +1368,7 @@ else:
     # Hybrid PoW / PoS
     #if type(diff) == dict:
     if coin == "peercoin":
-        diff = s.getdifficulty()['proof-of-work']
+        diff = prefetched("getdifficulty")['proof-of-work']
         
         # Print PoW diff only for simpler parsing on external scripts
         info['difficulty'] = diff
@@ -1117,11 +1376,52 @@ else:
         # Already here via getinfo(); getdifficulty() doesn't work in Patchcoin
         diff = info["difficulty"]
         
-    md = meandiff(coin, diff)
+    if options.chaindiff:
+        md = meandiff2(coin, options.samples, options.spacing)
+    else:
+        c = registry[coin]
+        if c.adjustblocks > 0:
+            retarget = c.adjustblocks * 3600. / c.blocksperhour
+            nextretarget = (c.adjustblocks - info["blocks"] % c.adjustblocks) * 3600. / c.blocksperhour
+        else:
+            retarget = 0
+            nextretarget = 0
+
+        md = meandiff(coin, diff, options.window * 3600, options.model, options.halflife * 3600, retarget, nextretarget)
+
     if md > 0:
         keys.append('meandiff')
         info['meandiff'] = md
 
+if len(options.sweep) > 0:
+    # Other parameters as given, or as in the usual calculation below
+    axes = {}
+    for arg in options.sweep:
+        (name, eq, spec) = arg.partition("=")
+        if name not in ["hashrate", "watts", "kwhprice", "diff", "price"] or len(spec) == 0:
+            parser.error("Unknown --sweep " + arg)
+        axes[name] = sweep_values(spec)
+
+    if "diff" not in axes:
+        if 'meandiff' in info.keys() and not options.diff:
+            axes["diff"] = [info['meandiff']]
+        else:
+            axes["diff"] = [diff]
+
+    if "hashrate" not in axes:
+        if options.hashrate <= 0:
+            parser.error("--sweep needs a hashrate, with -r or --sweep hashrate=...")
+        axes["hashrate"] = [options.hashrate]
+
+    if "price" not in axes:
+        axes["price"] = [coin_price(coin, options.basecur)]
+
+    axes.setdefault("watts", [options.watts])
+    axes.setdefault("kwhprice", [options.kwhprice])
+
+    sweep(axes, info["blocks"], options.csv)
+    exit()
+
 output = []
 for key in keys:
     output.append([key, str(info[key])])
@@ -1135,11 +1435,11 @@ if options.hashrate:
     # No point in printing this, if supplied manually
 else:
     if coin == "primecoin":
-        hashrate = s.getmininginfo()["blocksperday"]
+        hashrate = prefetched("getmininginfo")["blocksperday"]
         if options.verbose:
             output.append(["blocksperday", str(hashrate)])
     elif coin == "gapcoin":
-        hashrate = s.getprimespersec()
+        hashrate = prefetched("getprimespersec")
     elif coin in ["bitcoin", "dogecoin", "groestlcoin", "litecoin", "ExclusiveCoin", "zcash", "zclassic", "zen"]:
         # Litecoin: Mining was removed from the client in 0.8
         # EXCL: not available
@@ -1148,7 +1448,7 @@ else:
         hashrate = 0
     else:
         try:
-            mi = s.getmininginfo()
+            mi = prefetched("getmininginfo")
             if "hashespersec" in mi:
                 hashrate = mi["hashespersec"]
             else:
@@ -1157,7 +1457,7 @@ else:
             hashrate = s.gethashespersec()
 
 try:
-    networkhashrate = s.getmininginfo()["networkhashps"]
+    networkhashrate = prefetched("getmininginfo")["networkhashps"]
 except:
     networkhashrate = 0
             
@@ -1170,10 +1470,10 @@ if coin != "primecoin" and options.verbose:
 blocks = info["blocks"]
 
 if options.verbose:
-    output.append(["block reward", str(blockreward(coin, diff, blocks)) + " " + currency[coin]])
+    output.append(["block reward", str(blockreward(coin, diff, blocks)) + " " + registry[coin].ticker])
 
     fiatprice = coin_price(coin, options.basecur)
-    output.append(["1 %s" % currency[coin], "%f %s" % (fiatprice, options.basecur)])
+    output.append(["1 %s" % registry[coin].ticker, "%f %s" % (fiatprice, options.basecur)])
 
     fiat_balance = fiatprice * info["balance"]
     if fiat_balance > 0:
@@ -1204,34 +1504,22 @@ if hashrate > 0 and coin != "riecoin":
     # bypassed here too. As a raw data approach it has some academic
     # interest, so leave here as a warning.
     #if networkhashrate > 0 and not options.diff:
-    #    blocktime = networkhashrate * 3600. / (hashrate * blocksperhour[coin])
+    #    blocktime = networkhashrate * 3600. / (hashrate * registry[coin].blocksperhour)
 
-    if coin == "primecoin":
-        blocktime = 86400. / hashrate
-    elif coin == "gapcoin":
-        # From http://coinia.net/gapcoin/calc.php
-        blocktime = exp(diff) / hashrate
-    elif coin == "cryptonite":
-        # Guess based on current network hashrate and difficulty
-        blocktime = diff * 2**20 / hashrate
-    elif coin in ["btcprivate", "zcash", "zclassic", "zen"]:
-        # Guess based on networkhashrate comparisons
-        blocktime = diff * 2**13 / hashrate
-    else:
-        # Bitcoin and most derivatives
-        blocktime = diff * 2**32 / hashrate
+    blocktime = mining_blocktime(coin, diff, hashrate)
 
     reward = blockreward(coin, diff, blocks)
 
     devtax = devtax_percent(coin, blocks)
     if devtax > 0:
         reward -= reward * devtax / 100.0
-        print("\nMiners' share %f %s per block after %f %% developer tax" % (reward, currency[options.coin], devtax))
+        print("\nMiners' share %f %s per block after %f %% developer tax" % (reward, registry[coin].ticker, devtax))
         
     output += profit(blocktime, reward, options.coin, options.watts, options.kwhprice, fiatprice, options.basecur)
 
-if adjustblocks[coin] > 0:
-    adjtime = (adjustblocks[coin] - blocks % adjustblocks[coin]) / float(blocksperhour[coin]) * 3600
+c = registry[coin]
+if c.adjustblocks > 0:
+    adjtime = (c.adjustblocks - blocks % c.adjustblocks) / float(c.blocksperhour) * 3600
     tp = timeprint(adjtime)
     output.append(["\nNext difficulty expected in", str(tp[0]) + " " + tp[1]])
 
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+# 2026-10-18
+
+# Resident coinfo.py, for monitoring that asks the same things many
+# times a minute. coinfod.py --serve keeps one process running, with
+# the daemon connections, prices and block headers cached in memory,
+# and answers queries on a Unix socket. Otherwise this is a thin
+# client that takes the usual coinfo.py options:
+#
+# coinfod.py --serve &
+# coinfod.py -B -r 1.2e9
+#
+# Only read-only queries go through the service; anything that sends
+# coins, touches keys or prompts for input, or any query when the
+# service is not running, runs coinfo.py directly instead.
+
+import os
+import socket
+import sys
+import json
+
+sockpath = os.path.expanduser("~/.bittools/coinfo.sock")
+
+coinfo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coinfo.py")
+
+# Options that change the wallet, show keys or ask for input
+denied_long = ["--backupwallet", "--encrypt", "--exportkeys", "--exportnonempty", "--fifo", "--importkeys", "--listdesc", "--newaddress", "--sendto", "--txfee", "--unlock"]
+denied_short = "eiNs"
+
+# coinfo.py has no timeout by default, but queries are answered one at
+# a time here, so a hung daemon would hold up every client
+serve_timeout = 30
+
+def allowed(args):
+    for arg in args:
+        if arg.startswith("--"):
+            name = arg.split("=")[0]
+            # optparse also takes unique abbreviations
+            for d in denied_long:
+                if d.startswith(name):
+                    return False
+        elif arg.startswith("-"):
+            for c in arg[1:]:
+                if c in denied_short:
+                    return False
+
+    return True
+
+def has_timeout(args):
+    for arg in args:
+        name = arg.split("=")[0]
+        if len(name) > 2 and name.startswith("--") and "--timeout".startswith(name):
+            return True
+
+    return False
+
+def query(args):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(sockpath)
+    conn.sendall((json.dumps(args) + "\n").encode("utf-8"))
+
+    data = b""
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    conn.close()
+
+    reply = json.loads(data.decode("utf-8"))
+    sys.stdout.write(reply["output"])
+
+    return reply["status"]
+
+def run(code, args):
+    # One coinfo.py run inside this process, with its output captured
+    if sys.version_info >= (3, 0):
+        from io import StringIO
+    else:
+        from StringIO import StringIO
+
+    output = StringIO()
+    (stdout, stderr, argv) = (sys.stdout, sys.stderr, sys.argv)
+
+    sys.stdout = output
+    sys.stderr = output
+    sys.argv = [coinfo] + args
+
+    status = 0
+
+    try:
+        exec(code, {"__name__": "__main__", "__file__": coinfo})
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            output.write(str(e.code) + "\n")
+            status = 1
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        status = 1
+    finally:
+        (sys.stdout, sys.stderr, sys.argv) = (stdout, stderr, argv)
+
+    return {"status": status, "output": output.getvalue()}
+
+def serve():
+    # Imported here, so that the client stays light; coinfo.py finds
+    # these already loaded, with their caches
+    sys.path.insert(0, os.path.dirname(coinfo))
+    import bittools
+
+    File = open(coinfo, "r")
+    code = compile(File.read(), coinfo, "exec")
+    File.close()
+
+    if os.path.exists(sockpath):
+        os.unlink(sockpath)
+
+    # The socket is for this user only
+    os.umask(0o077)
+    if not os.path.isdir(os.path.dirname(sockpath)):
+        os.makedirs(os.path.dirname(sockpath))
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(sockpath)
+    listener.listen(16)
+
+    # One query at a time, so that each daemon connection is only used
+    # from this thread
+    while True:
+        (conn, addr) = listener.accept()
+
+        try:
+            File = conn.makefile("rb")
+            args = json.loads(File.readline().decode("utf-8"))
+            File.close()
+
+            if not has_timeout(args):
+                args = ["--timeout", str(serve_timeout)] + args
+
+            if allowed(args):
+                reply = run(code, args)
+            else:
+                reply = {"status": 1, "output": "Not available through coinfod.py\n"}
+
+            conn.sendall(json.dumps(reply).encode("utf-8"))
+        except Exception as e:
+            sys.stderr.write("coinfod.py: %s\n" % e)
+
+        conn.close()
+
+if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+    serve()
+
+args = sys.argv[1:]
+
+if allowed(args):
+    try:
+        sys.exit(query(args))
+    except socket.error:
+        # No service running
+        pass
+
+os.execv(sys.executable, [sys.executable, coinfo] + args)
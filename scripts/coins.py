@@ -0,0 +1,615 @@
+# 2026-10-18 by teknohog
+
+# Coin registry for the bittools scripts. Everything known about a
+# coin is in one entry of coin_table below, instead of a dozen
+# parallel dicts and if/elif chains. Each entry is compiled once into
+# a Coin record, with the reward schedule as an object, so that the
+# lookups are simple attribute access.
+#
+# More coins, or changes to the built-in ones, can be given in
+# ~/.bittools/coins.json with the same keys, e.g.
+#
+# {"bitcoin": {"port": "8336"},
+#  "newcoin": {"ticker": "NEW", "port": "9999", "blocksperhour": 30,
+#              "reward": ["halving", 50, 840000]}}
+
+import os.path
+from bisect import bisect_right
+from math import ceil, exp, log
+
+coinsfile = os.path.expanduser("~/.bittools/coins.json")
+
+def exp_decay(init, blocks, period, base=0.5):
+    p = ceil(float(blocks) / float(period - 2))
+    return init * base**(p - 1)
+
+def decay_sum(init, blocks, period, base=0.5, floor=0):
+    # Total of max(exp_decay(...), floor) over heights 0 to blocks - 1.
+    # The reward is flat for each step of period - 2 blocks, so this is
+    # a geometric series up to the floor, and flat after that.
+    if blocks <= 0:
+        return 0.
+
+    if base >= 1:
+        return blocks * float(init)
+
+    q = period - 2
+    (steps, rest) = divmod(blocks - 1, q)
+
+    # Steps with the reward still above the floor
+    full = steps + 1
+    if floor > 0:
+        full = max(int(ceil(log(float(floor) / init) / log(base))), 0)
+        while full > 0 and init * base**(full - 1) < floor:
+            full -= 1
+        while init * base**full >= floor:
+            full += 1
+    full = min(full, steps)
+
+    # Height 0 is off by one step in exp_decay()
+    total = max(init / float(base), floor)
+    total += q * init * (1 - base**full) / (1 - base)
+    total += (steps - full) * q * floor
+    total += rest * max(init * base**steps, floor)
+
+    return total
+
+def groestl_reward(diff, blocks):
+    if blocks >= 150000:
+        return max(exp_decay(25, blocks-150000, 10080, 0.99), 5)
+
+    if blocks >= 120000:
+        return exp_decay(250, blocks-120000, 1440, 0.9)
+
+    # Default to old scheme
+    return exp_decay(512, blocks, 10080, 0.94)
+
+def firo_reward(diff, blocks):
+    # 2022-09-26 Following the hard fork at block 486221. I'm not sure
+    # how the halving period applies after that, but this is a start,
+    # based on firo/src/chainparams.cpp.
+    if blocks < 302438:
+        return 25
+    elif blocks < 486221:
+        return 12.5
+    else:
+        return exp_decay(6.25, blocks - 486221, 840000)
+
+def peercoin_reward(diff, blocks):
+    # https://bitcointalk.org/index.php?topic=101820.msg1118737#msg1118737
+    # "The block reward for a work block is sqrt(sqrt(9999^4 /
+    # difficulty)), rounded down to the next cent boundary."
+    return int(999900. / diff**0.25) / 100.
+
+def primecoin_reward(diff, blocks):
+    # block reward = 999 / diff**2, likewise floored to cent
+    return int(99900. / diff**2) / 100.
+
+def gapcoin_reward(diff, blocks):
+    return exp_decay(diff, blocks, 420000)
+
+def blake_reward(diff, blocks, init):
+    return init + round((blocks * diff * 256)**0.5) * 1e-8
+
+def dash_reward(diff, blocks):
+    return max(2222222. / (((diff + 2600.)/9.)**2), 5.0)
+
+# 2026-10-18 Array versions for whole ranges of heights at once. NumPy
+# is imported only in these, as it takes longer to load than most
+# scripts need to run.
+
+def powers(base, k):
+    # base**k for an integer array k, which only has a few distinct
+    # values here, so look them up instead
+    import numpy
+
+    if len(k) == 0:
+        return numpy.zeros(0)
+
+    lo = int(k.min())
+    return numpy.take(base ** numpy.arange(lo, int(k.max()) + 1, dtype = float), k - lo)
+
+def exp_decays(init, blocks, period, base=0.5):
+    import numpy
+    p = -(-numpy.asarray(blocks, dtype = numpy.int64) // (period - 2))
+    return init * powers(base, p - 1)
+
+# The height-only formulas above as segments of exp_decay(), (start,
+# init, period, base, floor) each, for their supply in closed form
+groestl_segments = [(0, 512, 10080, 0.94), (120000, 250, 1440, 0.9), (150000, 25, 10080, 0.99, 5)]
+firo_segments = [(0, 25, 0, 1), (302438, 12.5, 0, 1), (486221, 6.25, 840000)]
+
+# Reward schedules: reward(diff, blocks) for the block reward, and
+# supply(blocks) for (coins so far, coins ever), with 0 for unknown.
+# rewards() and supplies() do the same for arrays of heights, and
+# milestones() gives the heights where the reward has halved, or
+# changed for stairs, up to end for schedules that need to look.
+
+class Halving(object):
+    # Regular halving, or another base for the decay. ramp is the
+    # length of a linear ramp-up at the start, as in Zcash.
+    __slots__ = ["init", "period", "base", "ramp"]
+
+    def __init__(self, init, period, base = 0.5, ramp = 0):
+        self.init = init
+        self.period = period
+        self.base = base
+        self.ramp = ramp
+
+    def reward(self, diff, blocks):
+        reward = exp_decay(self.init, blocks, self.period, self.base)
+
+        if self.ramp > 0:
+            reward *= min(blocks / float(self.ramp), 1)
+
+        return reward
+
+    def ramp_deficit(self, blocks):
+        # Coins short of the full reward in the first blocks of the
+        # ramp-up, which fits in the first step of exp_decay()
+        m = min(blocks, self.ramp)
+        if m <= 0:
+            return 0.
+
+        return self.init / self.base + self.init * (m - 1) * (1 - m / (2. * self.ramp))
+
+    def supply(self, blocks):
+        # Summed over the same steps of period - 2 blocks as in
+        # exp_decay(), so that this matches the rewards block by block
+        total = decay_sum(self.init, blocks, self.period, self.base)
+        final_total = self.init / self.base + (self.period - 2) * self.init / (1 - self.base)
+
+        if self.ramp > 0:
+            total -= self.ramp_deficit(blocks)
+            final_total -= self.ramp_deficit(self.ramp)
+
+        return (total, final_total)
+
+    def rewards(self, diff, heights):
+        import numpy
+        h = numpy.asarray(heights, dtype = numpy.int64)
+
+        reward = exp_decays(self.init, h, self.period, self.base)
+
+        if self.ramp > 0:
+            reward *= numpy.minimum(h / float(self.ramp), 1)
+
+        return reward
+
+    def supplies(self, heights):
+        # As supply(), in closed form for all heights
+        import numpy
+        h = numpy.asarray(heights, dtype = numpy.int64)
+
+        q = self.period - 2
+        (steps, rest) = numpy.divmod(numpy.maximum(h - 1, 0), q)
+
+        final_total = self.init / self.base + q * self.init / (1 - self.base)
+
+        # In place, as these arrays may be large
+        reward = powers(self.base, steps)
+        total = reward * (-q * self.init / (1 - self.base))
+        total += final_total
+        reward *= rest * self.init
+        total += reward
+        total[h <= 0] = 0
+
+        if self.ramp > 0:
+            m = numpy.minimum(h, self.ramp)
+            total -= numpy.where(m > 0, self.init / self.base + self.init * (m - 1) * (1 - m / (2. * self.ramp)), 0)
+            final_total -= self.ramp_deficit(self.ramp)
+
+        return (total, final_total)
+
+    def milestones(self, end):
+        # The reward changes at multiples of period - 2 in exp_decay().
+        # With a slower decay, take the steps closest to halvings.
+        if self.base >= 1:
+            return []
+
+        step = max(int(round(log(0.5) / log(self.base))), 1)
+
+        heights = []
+        k = step
+        while self.init * self.base**k >= 1e-8 and len(heights) < 64:
+            heights.append(k * (self.period - 2) + 1)
+            k += step
+
+        return heights
+
+class Constant(object):
+    __slots__ = ["init"]
+
+    def __init__(self, init):
+        self.init = init
+
+    def reward(self, diff, blocks):
+        return self.init
+
+    def supply(self, blocks):
+        return (blocks * self.init, 0)
+
+    def rewards(self, diff, heights):
+        import numpy
+        return numpy.full(len(heights), float(self.init))
+
+    def supplies(self, heights):
+        import numpy
+        return (numpy.asarray(heights, dtype = float) * self.init, 0)
+
+    def milestones(self, end):
+        return []
+
+class Stairs(object):
+    # Fixed rewards starting from the given block limits, with the
+    # totals of the finished steps precomputed
+    __slots__ = ["limits", "amounts", "totals"]
+
+    def __init__(self, limits, amounts):
+        self.limits = limits
+        self.amounts = amounts
+
+        self.totals = [0]
+        for j in range(len(limits) - 1):
+            self.totals.append(self.totals[-1] + (limits[j+1] - limits[j]) * amounts[j])
+
+    def step(self, blocks):
+        return max(bisect_right(self.limits, blocks) - 1, 0)
+
+    def reward(self, diff, blocks):
+        return self.amounts[self.step(blocks)]
+
+    def supply(self, blocks):
+        i = self.step(blocks)
+        return (self.totals[i] + (blocks - self.limits[i]) * self.amounts[i], 0)
+
+    def steps(self, heights):
+        import numpy
+        h = numpy.asarray(heights, dtype = numpy.int64)
+        return (h, numpy.maximum(numpy.searchsorted(self.limits, h, side = "right") - 1, 0))
+
+    def rewards(self, diff, heights):
+        import numpy
+        (h, i) = self.steps(heights)
+        return numpy.take(numpy.asarray(self.amounts, dtype = float), i)
+
+    def supplies(self, heights):
+        # Linear within each step, so one lookup for each coefficient
+        import numpy
+        (h, i) = self.steps(heights)
+
+        amounts = numpy.asarray(self.amounts, dtype = float)
+        offsets = numpy.asarray(self.totals, dtype = float) - numpy.asarray(self.limits, dtype = float) * amounts
+
+        return (numpy.take(offsets, i) + h * numpy.take(amounts, i), 0)
+
+    def milestones(self, end):
+        return list(self.limits[1:])
+
+class Formula(object):
+    # Any other reward function of (diff, blocks, *args). If it only
+    # depends on the height, segments has the same as pieces of
+    # exp_decay(), for the supply and milestones. Otherwise there is
+    # no emission schedule to speak of.
+    __slots__ = ["function", "segments", "args"]
+
+    def __init__(self, function, segments, *args):
+        self.function = function
+        self.segments = segments
+        self.args = args
+
+    def reward(self, diff, blocks):
+        return self.function(diff, blocks, *self.args)
+
+    def pieces(self, end):
+        # (segment, first height, end height) up to end
+        for j in range(len(self.segments)):
+            start = self.segments[j][0]
+            if start >= end:
+                break
+
+            if j + 1 < len(self.segments):
+                stop = min(self.segments[j+1][0], end)
+            else:
+                stop = end
+
+            yield (self.segments[j], start, stop)
+
+    def supply(self, blocks):
+        if self.segments is None:
+            return (0, 0)
+
+        total = 0.
+        for (segment, start, stop) in self.pieces(blocks):
+            total += decay_sum(segment[1], stop - start, *segment[2:])
+
+        return (total, 0)
+
+    def rewards(self, diff, heights):
+        import numpy
+        return numpy.array([self.function(diff, h, *self.args) for h in heights], dtype = float)
+
+    def supplies(self, heights):
+        import numpy
+        return (numpy.array([self.supply(h)[0] for h in heights], dtype = float), 0)
+
+    def milestones(self, end):
+        # First heights where the reward is down to half of the last
+        # milestone. The reward only changes at the steps of each
+        # segment, so look at those.
+        if self.segments is None:
+            return []
+
+        steps = []
+        for (segment, start, stop) in self.pieces(end):
+            # From block 1, as exp_decay() is off at block 0
+            if segment[3:4] == (1,):
+                steps.append(max(start, 1))
+            else:
+                if start > 0:
+                    steps.append(start)
+                steps += range(start + 1, stop, segment[2] - 2)
+
+        heights = []
+        target = self.function(0, steps[0], *self.args) / 2.
+        for h in steps[1:]:
+            r = self.function(0, h, *self.args)
+            if r <= target:
+                heights.append(h)
+                target = r / 2.
+                if len(heights) >= 64:
+                    break
+
+        return heights
+
+schedules = {
+    "halving": Halving,
+    "constant": Constant,
+    "stairs": Stairs,
+}
+
+# (reward function, its segments for height-only rewards)
+formulas = {
+    "blake": (blake_reward, None),
+    "dash": (dash_reward, None),
+    "firo": (firo_reward, firo_segments),
+    "gapcoin": (gapcoin_reward, None),
+    "groestl": (groestl_reward, groestl_segments),
+    "peercoin": (peercoin_reward, None),
+    "primecoin": (primecoin_reward, None),
+}
+
+def schedule(spec):
+    # ["halving", 50, 210000] -> Halving(50, 210000) etc.
+    if spec is None:
+        return None
+    elif spec[0] in schedules:
+        return schedules[spec[0]](*spec[1:])
+    else:
+        (function, segments) = formulas[spec[0]]
+        return Formula(function, segments, *spec[1:])
+
+# Average seconds to find a block, for hashes (or similar) per second
+blocktimes = {
+    "hash": lambda diff, hashrate, unit: diff * unit / hashrate,
+    # hashrate is blocksperday here
+    "blocksperday": lambda diff, hashrate, unit: 86400. / hashrate,
+    # From http://coinia.net/gapcoin/calc.php
+    "gap": lambda diff, hashrate, unit: exp(diff) / hashrate,
+}
+
+class Coin(object):
+    __slots__ = ["name", "ticker", "family", "port", "confdir", "url", "blocksperhour", "adjustblocks", "schedule", "emission", "devtax", "labels", "blocktime", "hashunit", "baseunit", "divisor"]
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.ticker = spec["ticker"]
+
+        # bitcoin for the Bitcoin-like daemons, cryptonote or ethereum
+        self.family = spec.get("family", "bitcoin")
+
+        # Default RPC port and config dir, or a fixed URL
+        self.port = spec.get("port")
+        self.confdir = spec.get("confdir", name)
+        self.url = spec.get("url")
+
+        # 0 means dynamic difficulty adjustment without fixed intervals
+        self.blocksperhour = spec.get("blocksperhour", 0)
+        self.adjustblocks = spec.get("adjustblocks", 0)
+
+        # No schedule when the reward comes from the daemon. The
+        # emission schedule for supply totals may be a simpler
+        # approximation of the reward schedule, or None if unknown.
+        self.schedule = schedule(spec.get("reward"))
+        self.emission = schedule(spec.get("supply", spec.get("reward")))
+
+        # Developer tax percentage by block height, e.g. as stairs
+        self.devtax = schedule(spec.get("devtax"))
+
+        # "account" changed to "label" in these coins, need different
+        # function and key names
+        self.labels = spec.get("labels", False)
+
+        if self.family == "bitcoin":
+            hashunit = 2**32
+        else:
+            hashunit = 1
+
+        self.blocktime = blocktimes[spec.get("blocktime", "hash")]
+        self.hashunit = spec.get("hashunit", hashunit)
+
+        # Cryptonote amounts
+        self.baseunit = spec.get("baseunit", 1e-8)
+        self.divisor = spec.get("divisor", 0)
+
+# Cryptonote wallet ports may vary much more, so these are daemon
+# ports only.
+coin_table = {
+    "AuroraCoin": {"ticker": "AUR", "port": "12341", "blocksperhour": 6, "adjustblocks": 8, "reward": ["halving", 25, 420000]},
+    "bitcoin": {"ticker": "BTC", "port": "8332", "blocksperhour": 6, "adjustblocks": 2016, "reward": ["halving", 50, 210000], "labels": True},
+    # 2020-10-14 Files are named as in Bitcoin. The coin option is
+    # mainly useful for setting the currency ticker for price info.
+    "bitcoincash": {"ticker": "BCH", "port": "8332", "confdir": "bitcoin", "blocksperhour": 6, "adjustblocks": 2016, "reward": ["halving", 50, 210000], "labels": True},
+    "bitcoin-sv": {"ticker": "BSV", "port": "8332", "confdir": "bitcoin", "blocksperhour": 6, "adjustblocks": 2016, "reward": ["halving", 50, 210000]},
+    # fork starting at 1.5625 given the halving logic
+    "btcprivate": {"ticker": "BTCP", "port": "7932", "blocksperhour": 24, "reward": ["halving", 3.125, 210000], "hashunit": 2**13},
+    "blakebitcoin": {"ticker": "BBTC", "port": "243", "blocksperhour": 24, "adjustblocks": 8064, "reward": ["halving", 50, 210000]},
+    "blakecoin": {"ticker": "BLC", "port": "8772", "blocksperhour": 20, "adjustblocks": 20, "reward": ["blake", 25], "supply": ["constant", 25]},
+    "chncoin": {"ticker": "CNC", "port": "8108", "blocksperhour": 60, "reward": ["halving", 88, 2628000]},
+    # Reward from the coinbase balance, and guess the hashrate based
+    # on current network hashrate and difficulty
+    "cryptonite": {"ticker": "XCN", "port": "8252", "blocksperhour": 60, "hashunit": 2**20},
+    "dash": {"ticker": "DASH", "port": "9998", "blocksperhour": 24, "reward": ["dash"]},
+    "dirac": {"ticker": "XDQ", "port": "74532", "blocksperhour": 20, "adjustblocks": 20,
+              "reward": ["stairs", [0, 43201, 744001, 1448001, 2145601, 2846401],
+                         [8.0, 1.25, 0.75, 0.5, 0.25, 0.01]]},
+    "dogecoin": {"ticker": "DOGE", "port": "22555", "blocksperhour": 60,
+                 "reward": ["stairs", [0, 100000, 200000, 300000, 400000, 500000, 600000],
+                            [500000, 250000, 125000, 62500, 31250, 15625, 10000]]},
+    "ecoin": {"ticker": "ECN", "port": "10444", "blocksperhour": 60, "adjustblocks": 100, "reward": ["constant", 700], "supply": None},
+    # adjustblocks ?
+    "electron": {"ticker": "ELT", "port": "6852", "blocksperhour": 60,
+                 "reward": ["stairs", [0, 525600, 1051200], [20, 10, 5]]},
+    "ExclusiveCoin": {"ticker": "EXCL", "port": "22621", "blocksperhour": 90,
+                      "reward": ["stairs", [0, 1120706], [8, 4]]},
+    "groestlcoin": {"ticker": "GRS", "port": "1441", "blocksperhour": 60, "reward": ["groestl"], "labels": True},
+    "gapcoin": {"ticker": "GAP", "port": "31397", "blocksperhour": 24, "reward": ["gapcoin"], "blocktime": "gap"},
+    "litecoin": {"ticker": "LTC", "port": "9332", "blocksperhour": 24, "adjustblocks": 2016, "reward": ["halving", 50, 840000], "labels": True},
+    "lithium": {"ticker": "LIT", "port": "12000", "blocksperhour": 20, "adjustblocks": 20,
+                "reward": ["stairs", [0, 2000, 175000, 350000, 525000, 650000, 800000, 975000],
+                           [0.48, 48, 24, 12, 6, 3, 1.5, 1]]},
+    "maxcoin": {"ticker": "MAX", "port": "8669", "blocksperhour": 120, "reward": ["halving", 48, 1051200]},
+    "namecoin": {"ticker": "NMC", "port": "8332", "blocksperhour": 6, "adjustblocks": 2016, "reward": ["constant", 50]},
+    "photon": {"ticker": "PHO", "port": "8984", "blocksperhour": 20, "adjustblocks": 20, "reward": ["blake", 32768], "supply": ["constant", 32768]},
+    # Proof of Stake only
+    "patchcoin": {"ticker": "PTC", "port": "7802", "reward": ["constant", 0], "labels": True},
+    "peercoin": {"ticker": "PPC", "port": "9902", "blocksperhour": 6, "reward": ["peercoin"], "labels": True},
+    "primecoin": {"ticker": "XPM", "port": "9912", "blocksperhour": 60, "reward": ["primecoin"], "blocktime": "blocksperday"},
+    "primio": {"ticker": "Primio", "port": "1218", "blocksperhour": 12, "adjustblocks": 12, "reward": ["halving", 50, 100000]},
+    "riecoin": {"ticker": "RIC", "port": "28332", "blocksperhour": 24, "adjustblocks": 288, "reward": ["halving", 50, 840000]},
+    # Reward not meaningful for mostly proof of stake coin
+    "ShibeCoin": {"ticker": "Shibe", "port": "18812", "blocksperhour": 60, "reward": ["constant", 0]},
+    "skeincoin": {"ticker": "SKC", "port": "21230", "blocksperhour": 30, "reward": ["halving", 32, 262800]},
+    "Slothcoin": {"ticker": "Sloth", "port": "5108", "blocksperhour": 24, "adjustblocks": 2, "reward": ["halving", 500000, 100000]},
+    "TjcoinV2": {"ticker": "TJC", "port": "9178", "blocksperhour": 24, "adjustblocks": 336, "reward": ["halving", 50, 840000]},
+    # Minimum reward, so no supply estimate from it
+    "universalmolecule": {"ticker": "UMO", "port": "19738", "blocksperhour": 30, "adjustblocks": 20, "reward": ["constant", 0.1], "supply": None},
+    # No login credentials needed. Blocks per hour is a mean?
+    # Reward from the last PoW block.
+    "Vcash": {"ticker": "XVC", "port": "9195", "url": "http://localhost:9195/", "blocksperhour": 25},
+    "vertcoin": {"ticker": "VTC", "port": "5888", "blocksperhour": 24, "reward": ["halving", 50, 840000]},
+    # 8000 coins per block, reduces by 0.5% each week starting 2/28/14
+    "virtacoin": {"ticker": "VTA", "port": "22815", "blocksperhour": 60, "reward": ["halving", 8000, 10080, 0.995]},
+    # Linear ramp-up for the first 20000 blocks, then basic halving.
+    # Dev tax until first halving only.
+    "zcash": {"ticker": "ZEC", "port": "8232", "blocksperhour": 24, "reward": ["halving", 12.5, 840000, 0.5, 20000],
+              "devtax": ["stairs", [0, 840001], [20, 0]], "hashunit": 2**13},
+    # 12.5 after first 10 blocks, so practically constant. Was 24
+    # blocks per hour.
+    "zclassic": {"ticker": "ZCL", "port": "8023", "blocksperhour": 48, "reward": ["halving", 0.78125, 840000], "hashunit": 2**13},
+    # Formerly Zcoin XZC. Port found by netstat, not what help says.
+    # adjustblocks guessed from block explorer. Znodes -- making money
+    # centralized again; 2022-09-26 new hard fork at block 486221.
+    "firo": {"ticker": "FIRO", "port": "8888", "blocksperhour": 24, "adjustblocks": 6, "reward": ["firo"],
+             "devtax": ["stairs", [0, 302438, 486221], [44, 50, 75]]},
+    "zen": {"ticker": "ZEN", "port": "8231", "blocksperhour": 24, "reward": ["halving", 12.5, 840000],
+            "devtax": ["constant", 30], "hashunit": 2**13},
+
+    # Cryptonote daemons, with /json_rpc. Rewards from the daemon.
+    # Money supply estimate from the reward divisor.
+    "aeon": {"ticker": "AEON", "family": "cryptonote", "port": "11181", "baseunit": 1e-12, "divisor": 2**18},
+    "boolberry": {"ticker": "BBR", "family": "cryptonote", "port": "10102", "baseunit": 1e-12, "divisor": 2**20},
+    "monero": {"ticker": "XMR", "family": "cryptonote", "port": "18081", "baseunit": 1e-12, "divisor": 2**20},
+    # Ticker, baseunit and divisor ?
+    "zano": {"ticker": "ZANO", "family": "cryptonote", "port": "11211", "baseunit": 1e-12, "divisor": 2**20},
+
+    "ethereum": {"ticker": "ETH", "family": "ethereum", "url": "http://localhost:8545", "reward": ["constant", 2]},
+    "ethereum-classic": {"ticker": "ETC", "family": "ethereum", "url": "http://localhost:8545", "reward": ["halving", 5, 5000000, 0.8]},
+    "ethereumpow": {"ticker": "ETHW", "family": "ethereum", "url": "http://localhost:8545", "reward": ["constant", 2]},
+}
+
+def load_registry(datafile = coinsfile):
+    # Built-in coins, with additions and changes from the data file
+    specs = dict([(name, dict(spec)) for (name, spec) in coin_table.items()])
+
+    if datafile is not None and os.path.exists(datafile):
+        import json
+
+        File = open(datafile, "r")
+        for (name, spec) in json.load(File).items():
+            specs.setdefault(name, {}).update(spec)
+        File.close()
+
+    return dict([(name, Coin(name, spec)) for (name, spec) in specs.items()])
+
+registry = load_registry()
+
+def schedule_reward(coin, diff, blocks):
+    # Block reward from the coin's known schedule, 0 if it only comes
+    # from the daemon
+    s = registry[coin].schedule
+
+    if s is None:
+        return 0
+
+    return s.reward(diff, blocks)
+
+def coin_supply(coin, blocks):
+    # (coins so far, coins ever) from the schedule, 0 for unknown
+    s = registry[coin].emission
+
+    if s is None:
+        return (0, 0)
+
+    return s.supply(blocks)
+
+def devtax_percent(coin, blocks):
+    # Depends on block height so need a proper function
+    s = registry[coin].devtax
+
+    if s is None:
+        return 0
+
+    return s.reward(0, blocks)
+
+def mining_blocktime(coin, diff, hashrate):
+    # Average seconds to find a block
+    c = registry[coin]
+    return c.blocktime(diff, hashrate, c.hashunit)
+
+def check_emission(coin, count = 2):
+    # Supply at the first few milestones against a plain sum of the
+    # block rewards, for the emission schedule of the coin. Returns
+    # the (height, summed, supply) that do not match.
+    s = registry[coin].emission
+
+    if s is None:
+        return []
+
+    bad = []
+    total = 0.
+    h = 0
+    for m in s.milestones(10**8)[:count]:
+        while h < m:
+            total += s.reward(0, h)
+            h += 1
+
+        supply = s.supply(m)[0]
+        if abs(supply - total) > 1e-9 * max(abs(total), 1):
+            bad.append((m, total, supply))
+
+    return bad
+
+if __name__ == "__main__":
+    # python coins.py [coin ...] checks the supply totals
+    import sys
+
+    coins = sys.argv[1:] or sorted(registry.keys(), key = str.lower)
+    failed = 0
+
+    for coin in coins:
+        for (m, total, supply) in check_emission(coin):
+            print("%s: supply %r at block %i, sum of rewards %r" % (coin, supply, m, total))
+            failed += 1
+
+    sys.exit(failed > 0)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+# 2026-10-18
+
+# One table for all local daemons: Bitcoin-like coins with a
+# ~/.<coin>/<coin>.conf, the Cryptonote daemons and an Ethereum
+# node. All daemons and the price lookup are queried at the same time,
+# so this takes about as long as the slowest of them. Daemons that do
+# not answer within the timeout are left out.
+#
+# Coins can also be listed explicitly, optionally as coin=url. For
+# mining payouts, give hashrates as coin=hashes/sec with -r, and for
+# the net profit, the power usage as coin=watts with -W.
+
+from bittools import *
+
+from threading import Thread
+
+import argparse
+parser = argparse.ArgumentParser()
+
+parser.add_argument("coins", nargs = "*", help = "Coins to show, optionally as coin=url, default all found")
+
+parser.add_argument("--basecur", default = "EUR", help="Base currency for coin prices, default EUR")
+
+parser.add_argument("-r", "--hashrate", action = "append", default = [], help="Hashes/sec for a coin as coin=hashrate, can be repeated")
+
+parser.add_argument("-W", "--watts", action = "append", default = [], help="Power usage of the miners for a coin as coin=watts, can be repeated")
+
+parser.add_argument("-w", "--kwh-price", dest = "kwhprice", type = float, default = 0, help="kWh price in the base currency")
+
+parser.add_argument("--timeout", type = float, default = 10, help="Timeout in seconds for each daemon, default %(default)s")
+
+options = parser.parse_args()
+
+def find_daemons():
+    # Coins with a config file, as in coin_url(). Bitcoin Cash and SV
+    # share bitcoin.conf, so only bitcoin shows up for that.
+    daemons = []
+
+    for coin in sorted(registry.keys(), key = str.lower):
+        c = registry[coin]
+
+        if c.family == "cryptonote":
+            daemons.append((coin, None))
+        elif c.family == "bitcoin" and c.confdir == coin:
+            if c.url is not None:
+                if os.path.isdir(os.path.expanduser("~/." + coin)):
+                    daemons.append((coin, None))
+            elif os.path.exists(os.path.expanduser("~/." + coin + "/" + coin + ".conf")):
+                daemons.append((coin, None))
+
+    daemons.append(("ethereum", None))
+
+    return daemons
+
+def bitcoin_info(coin, server):
+    # Older daemons only have getinfo
+    (chain, balance, diff) = rpc_batch(server, [("getblockchaininfo", []), ("getbalance", []), ("getdifficulty", [])])
+
+    if isinstance(chain, Exception):
+        info = server.getinfo()
+        blocks = info["blocks"]
+        balance = info["balance"]
+        diff = info["difficulty"]
+    else:
+        blocks = chain["blocks"]
+
+    if isinstance(diff, Exception):
+        raise diff
+
+    # Get the PoW entry from a mixed PoS/PoW coin
+    if type(diff) == dict:
+        diff = diff["proof-of-work"]
+
+    diff = float(diff)
+
+    if isinstance(balance, Exception):
+        balance = None
+
+    try:
+        reward = schedule_reward(coin, diff, blocks)
+        reward -= reward * devtax_percent(coin, blocks) / 100.0
+    except:
+        reward = 0
+
+    return {"coin": coin, "balance": balance, "difficulty": diff, "blocks": blocks, "reward": reward, "meandiff": meandiff(coin, diff)}
+
+def cryptonote_info(coin, server):
+    # As in cnfo.py
+    lasthead = server.getlastblockheader()["block_header"]
+
+    if coin in ["boolberry", "zano"]:
+        info = server.getinfo()
+    else:
+        info = server.get_info()
+
+    if coin == "zano":
+        diff = float(info["pow_difficulty"])
+        reward = 1
+    else:
+        diff = float(info["difficulty"])
+        reward = lasthead["reward"] * registry[coin].baseunit
+
+    return {"coin": coin, "balance": None, "difficulty": diff, "blocks": info["height"], "reward": reward, "meandiff": meandiff(coin, diff)}
+
+def ethereum_info(coin, server):
+    # As in etherinfo.py; chain id 61 is Ethereum Classic
+    (chainid, blocks, latest, accounts) = rpc_batch(server, [("eth_chainId", []), ("eth_blockNumber", []), ("eth_getBlockByNumber", ["latest", False]), ("eth_accounts", [])])
+
+    if isinstance(latest, Exception):
+        raise latest
+
+    blocks = int(blocks, 16)
+    diff = float(int(latest["difficulty"], 16))
+
+    if not isinstance(chainid, Exception) and int(chainid, 16) == 61:
+        coin = "ethereum-classic"
+
+    reward = schedule_reward(coin, diff, blocks)
+
+    balance = None
+    if not isinstance(accounts, Exception) and len(accounts) > 0:
+        balances = rpc_batch(server, [("eth_getBalance", [addr, "latest"]) for addr in accounts])
+        balance = sum([1e-18 * int(b, 16) for b in balances if not isinstance(b, Exception)])
+
+    return {"coin": coin, "balance": balance, "difficulty": diff, "blocks": blocks, "reward": reward, "meandiff": meandiff("ethereum", diff)}
+
+def query(coin, url, results):
+    try:
+        if url is None:
+            url = coin_url(coin)
+
+        # No retries, a daemon that is not running is simply left out
+        server = rpc_server(url, options.timeout, 0)
+
+        if coin in registry:
+            family = registry[coin].family
+        else:
+            family = "bitcoin"
+
+        if family == "cryptonote":
+            results[coin] = cryptonote_info(coin, server)
+        elif family == "ethereum":
+            results[coin] = ethereum_info(coin, server)
+        else:
+            results[coin] = bitcoin_info(coin, server)
+    except:
+        pass
+
+def query_prices(coins, prices):
+    try:
+        prices.update(coin_prices(coins, [options.basecur]))
+    except:
+        pass
+
+if len(options.coins) > 0:
+    daemons = []
+    for arg in options.coins:
+        if "=" in arg:
+            daemons.append(tuple(arg.split("=", 1)))
+        else:
+            daemons.append((arg, None))
+else:
+    daemons = find_daemons()
+
+hashrates = {}
+for arg in options.hashrate:
+    (coin, hashrate) = arg.split("=", 1)
+    hashrates[coin] = float(hashrate)
+
+watts = {}
+for arg in options.watts:
+    (coin, w) = arg.split("=", 1)
+    watts[coin] = float(w)
+
+results = {}
+prices = {}
+
+threads = [Thread(target = query, args = (coin, url, results)) for (coin, url) in daemons]
+
+# Ethereum Classic is only known after asking the node
+pricecoins = [coin for (coin, url) in daemons if coin in registry]
+if "ethereum" in pricecoins:
+    pricecoins.append("ethereum-classic")
+
+threads.append(Thread(target = query_prices, args = (pricecoins, prices)))
+
+deadline = time() + options.timeout
+
+for t in threads:
+    t.daemon = True
+    t.start()
+
+for t in threads:
+    t.join(max(deadline - time(), 0))
+
+output = [["Coin", "Balance", "Difficulty", "Meandiff", "Reward", options.basecur + " price", options.basecur + " balance", options.basecur + "/day"]]
+
+if len(watts) > 0:
+    output[0].append(options.basecur + " net/day")
+
+for (coin, url) in daemons:
+    # Copy, as the slow threads may still write into results
+    row = dict(results).get(coin)
+
+    if row is None:
+        continue
+
+    coin = row["coin"]
+    price = prices.get((coin, options.basecur), 0)
+
+    line = [coin]
+
+    if row["balance"] is None:
+        line.append("-")
+    else:
+        line.append(str(row["balance"]))
+
+    line += [str(row["difficulty"])]
+
+    if row["meandiff"] > 0:
+        line.append(str(row["meandiff"]))
+        diff = row["meandiff"]
+    else:
+        line.append("-")
+        diff = row["difficulty"]
+
+    line.append(str(row["reward"]))
+
+    if price > 0:
+        line.append("%f" % price)
+    else:
+        line.append("-")
+
+    if price > 0 and row["balance"] is not None:
+        line.append("%f" % (price * row["balance"]))
+    else:
+        line.append("-")
+
+    hashrate = hashrates.get(coin, 0)
+    if hashrate > 0 and row["reward"] > 0 and price > 0:
+        blocktime = mining_blocktime(coin, diff, hashrate)
+
+        fiatpay = row["reward"] / blocktime * 86400 * price
+        line.append("%f" % fiatpay)
+    else:
+        fiatpay = None
+        line.append("-")
+
+    if len(watts) > 0:
+        # As in profit()
+        if fiatpay is not None and watts.get(coin, 0) > 0:
+            cost = options.kwhprice * watts[coin] / 1000 * 24
+            line.append("%f" % (fiatpay - cost))
+        else:
+            line.append("-")
+
+    output.append(line)
+
+if len(output) > 1:
+    prettyprint(output)
+else:
+    print("No daemons found")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+# 2026-10-18
+
+# Copy meandiff.sh difflogs into the binary difficulty history
+# (diffhist in the same directory), which is never pruned. Only
+# records newer than the last stored one are added, so this can be
+# run again at any time, and meandiff.sh -s does so after each
+# sample.
+
+from bittools import *
+
+import argparse
+parser = argparse.ArgumentParser()
+
+parser.add_argument("difflog", nargs = "+", help = "meandiff.sh log files, e.g. ~/.blakecoin/difflog")
+
+parser.add_argument("-l", "--list", type = float, default = 0, help = "List the stored history of the last hours")
+
+parser.add_argument("-v", "--verbose", action = "store_true")
+
+options = parser.parse_args()
+
+for difflog in options.difflog:
+    histfile = os.path.join(os.path.dirname(os.path.abspath(difflog)), "diffhist")
+
+    if os.path.exists(difflog):
+        pairs = []
+        for line in ReadLines(difflog):
+            p = difflog_pair(line)
+            if p is not None:
+                pairs.append(p)
+
+        n = diffhist_append(histfile, pairs)
+
+        if options.verbose:
+            print("%s: %i new records" % (histfile, n))
+
+    if options.list > 0 and os.path.exists(histfile):
+        mm = diffhist_map(histfile)
+
+        if mm is not None:
+            output = []
+            for p in diffhist_pairs(diffhist_slice(mm, time() - options.list * 3600)):
+                output.append([ctime(p[0]), str(p[1])])
+
+            prettyprint(output)
@@ -23,7 +23,7 @@ def get_balance(addr):
     return fromhexwei(hwbal)
 
 def send(fromaddr, toaddr, amount):
-    print("About to send " + str(amount) + " " + currency[options.coin] + " from " + fromaddr + " to " + toaddr)
+    print("About to send " + str(amount) + " " + registry[options.coin].ticker + " from " + fromaddr + " to " + toaddr)
 
     if not confirm():
         exit()
@@ -82,29 +82,39 @@ parser.add_argument("-d", "--diff", type=float, default = 0, help="Set difficult
 
 parser.add_argument("--fraction", "-f", type = float, default = 0.5, help = "Lastsend fraction, default %(default)f")
 
+parser.add_argument("--halflife", type = float, default = 24, help="Hours for the weights to halve in --model ewls, default %(default)s")
+
 parser.add_argument("--lastsend", "-l", help = "Send a fraction (-f) of new income (-a) to this address")
 
 parser.add_argument("--minsend", "-m", type = float, default = 1, help = "Lower limit for lastsend, default %(default)f ETH")
 
+parser.add_argument("--model", choices = ["ols", "ewls"], default = "ols", help="Meandiff estimator: ols for linear regression (default), ewls for exponentially weighted regression")
+
 parser.add_argument("-p", "--pow", action="store_const", const="ethereumpow", dest="coin", default="ethereum", help="Connect to EthereumPoW")
 
 parser.add_argument("-R", "--blockreward", type=float, default = 0, help="Set alternative block reward for mining estimation")
 
 parser.add_argument("-r", "--hashrate", dest="hashrate", type=float, default = 0, help="Hashes/sec from external miners")
 
+parser.add_argument("--retries", type = int, default = 2, help="Retries when the daemon refuses connections, default %(default)s")
+
 parser.add_argument("--sendto", "-s", nargs = 2, help = "Send toaddress amount in ETH. The account must be unlocked.")
 
+parser.add_argument("--timeout", type = float, default = 0, help="Timeout in seconds for daemon calls, default none")
+
 parser.add_argument("-u", "--url", dest="url", default="http://localhost:8545", help="Connect to a different URL, instead of your local Ethereum daemon")
 
 parser.add_argument("-v", "--verbose", action = "store_true")
 
+parser.add_argument("--window", type = float, default = 0, help="Use only the last hours of the meandiff.sh log, default all")
+
 parser.add_argument("-W", "--watts", dest="watts", type=float, default = 0, help="Power usage of miners for profitability calculation")
 
 parser.add_argument("-w", "--kwhprice", dest="kwhprice", type=float, default = 0, help="kWh price for profitability calculation")
 
 options = parser.parse_args()
 
-daemon = Server(options.url)
+daemon = rpc_server(options.url, options.timeout, options.retries)
 
 info = {"hashrate": float(int(daemon.eth_hashrate(), 16)),
         "balances": list(map(get_balance, daemon.eth_accounts())),
@@ -121,11 +131,10 @@ if options.coin == "ethereum-classic":
         if os.path.isdir(os.path.expanduser(bd)):
             basedir = bd
             break
-
-    info["blockreward"] = exp_decay(5, info["blocks"], 5000000, 0.8)
 else:
     basedir = "~/.ethereum"
-    info["blockreward"] = 2
+
+info["blockreward"] = schedule_reward(options.coin, info["difficulty"], info["blocks"])
 
 if options.blockreward:
     info["blockreward"] = options.blockreward
@@ -149,7 +158,7 @@ if options.account_id > -1:
         # Just add that address into general info
         info["account " + str(aid) + " address"] = fromaddr
         
-md = meandiff("ethereum", info["difficulty"])
+md = meandiff("ethereum", info["difficulty"], options.window * 3600, options.model, options.halflife * 3600)
 if md > 0:
     info["meandiff"] = md
 
@@ -160,7 +169,7 @@ if options.verbose:
     fiatprice = coin_price(options.coin, options.basecur)
 
     if fiatprice > 0:
-        info["1 %s" % currency[options.coin]] = "%f %s" % (fiatprice, options.basecur)
+        info["1 %s" % registry[options.coin].ticker] = "%f %s" % (fiatprice, options.basecur)
         info["Fiat balance"] = "%f %s" % (fiatprice * info["total balance"], options.basecur)
         
 else:
@@ -176,7 +185,7 @@ if info["hashrate"] > 0:
     else:
         diff = info["difficulty"]
     
-    blocktime = diff / info["hashrate"]
+    blocktime = mining_blocktime(options.coin, diff, info["hashrate"])
         
     output = profit(blocktime, info["blockreward"], options.coin, options.watts, options.kwhprice, fiatprice, options.basecur)
 
@@ -246,6 +246,9 @@ if $SET; then
     
 	# prune
 	tail -n $LINES $LOGFILE > $LOGFILE.tmp && mv $LOGFILE.tmp $LOGFILE
+
+	# 2026-10-18 Keep the full history in binary, if available
+	diffhist.py $LOGFILE > /dev/null 2>&1
     fi
 else
     lin_reg
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+# 2026-10-18
+
+# Resident difficulty sampler, to replace a meandiff.sh -s cron entry
+# per coin. One process polls all the given daemons on a schedule,
+# keeping their connections open, and writes each sample to both the
+# difflog (as meandiff.sh does) and the binary diffhist. Each daemon
+# is polled in a thread of its own, so a slow one does not hold up the
+# others, and one that fails is retried with an increasing delay.
+#
+# Example: sampler.py blakecoin litecoin monero ethereum
+#
+# A URL can be given as coin=url, otherwise the usual local daemon is
+# used, as in coinfo.py, cnfo.py and etherinfo.py.
+
+from bittools import *
+
+from threading import Thread
+from time import sleep
+
+import argparse
+parser = argparse.ArgumentParser()
+
+parser.add_argument("coins", nargs = "+", help = "Coins to sample, optionally as coin=url")
+
+parser.add_argument("--interval", type = float, default = 60, help = "Minutes between samples, default %(default)s")
+
+parser.add_argument("--lines", type = int, default = 24, help = "Lines kept in the difflog, as in meandiff.sh, default %(default)s")
+
+parser.add_argument("--once", action = "store_true", help = "Take one round of samples and exit, e.g. for cron")
+
+parser.add_argument("--retries", type = int, default = 2, help="Retries when a daemon refuses connections, default %(default)s")
+
+parser.add_argument("--timeout", type = float, default = 30, help="Timeout in seconds for daemon connections, default %(default)s")
+
+parser.add_argument("-v", "--verbose", action = "store_true")
+
+options = parser.parse_args()
+
+def difficulty(coin, server):
+    if coin in registry:
+        family = registry[coin].family
+    else:
+        family = "bitcoin"
+
+    if family == "cryptonote":
+        if coin in ["boolberry", "zano"]:
+            info = server.getinfo()
+        else:
+            info = server.get_info()
+
+        if coin == "zano":
+            return float(info["pow_difficulty"])
+        else:
+            return float(info["difficulty"])
+    elif family == "ethereum":
+        return float(int(server.eth_getBlockByNumber("latest", False)["difficulty"], 16))
+    else:
+        diff = server.getdifficulty()
+
+        # Get the PoW entry from a mixed PoS/PoW coin
+        if type(diff) == dict:
+            diff = diff["proof-of-work"]
+
+        return float(diff)
+
+def record(coin, t, diff):
+    difflog = coindir(coin) + "/difflog"
+
+    # As in meandiff.sh: remove stale entries by removing the file
+    # itself, then append and prune
+    if os.path.exists(difflog) and t - os.path.getmtime(difflog) > 1e4:
+        os.unlink(difflog)
+
+    try:
+        lines = ReadLines(difflog)
+    except:
+        lines = []
+
+    # The new line and up to --lines - 1 old ones; a slice from -0
+    # would keep them all
+    lines = lines[max(len(lines) - options.lines + 1, 0):] + ["%i %s\n" % (t, repr(diff))]
+
+    tmpfile = difflog + ".tmp"
+    File = open(tmpfile, "w")
+    File.writelines(lines)
+    File.close()
+    os.rename(tmpfile, difflog)
+
+    diffhist_append(coindir(coin) + "/diffhist", [(t, diff)])
+
+interval = options.interval * 60
+
+daemons = []
+for arg in options.coins:
+    if "=" in arg:
+        (coin, url) = arg.split("=", 1)
+    else:
+        coin = arg
+        url = None
+
+    # due: time of next sample, failures: errors in a row
+    daemons.append({"coin": coin, "url": url, "due": time(), "failures": 0})
+
+def sample(d):
+    while True:
+        sleep(max(d["due"] - time(), 0))
+
+        try:
+            if d["url"] is None:
+                d["url"] = coin_url(d["coin"])
+
+            diff = difficulty(d["coin"], rpc_server(d["url"], options.timeout, options.retries))
+
+            # Zero diff is an error that sometimes comes out of RPC
+            if diff <= 0:
+                raise ValueError("zero difficulty")
+
+            t = int(time())
+            record(d["coin"], t, diff)
+
+            if options.verbose:
+                print("%s %s %s" % (ctime(t), d["coin"], diff))
+
+            d["failures"] = 0
+
+            # Stay on the same schedule, skipping missed rounds
+            while d["due"] <= time():
+                d["due"] += interval
+        except Exception as e:
+            d["failures"] += 1
+
+            # Back off from a minute up to the full interval
+            d["due"] = time() + min(60 * 2**(d["failures"] - 1), interval)
+
+            if options.verbose:
+                print("%s %s failed: %s" % (ctime(), d["coin"], e))
+
+        if options.once:
+            break
+
+threads = [Thread(target = sample, args = (d,)) for d in daemons]
+
+for t in threads:
+    t.daemon = True
+    t.start()
+
+# With a timeout, so that Ctrl-C still gets through
+for t in threads:
+    while t.is_alive():
+        t.join(1)